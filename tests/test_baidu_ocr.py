@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import base64
+import io
+import json
+import os
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+from urllib.parse import parse_qs
+
+from PIL import Image
+
+from videotitler.baidu_ocr import (
+    BaiduOcrClient,
+    _build_ocr_form_body,
+    _encode_frame_for_ocr,
+    _jpeg_dimensions,
+    _maybe_compress_image_for_ocr,
+)
+
+
+def _token_response(token: str, expires_in: int = 2592000) -> mock.Mock:
+    response = mock.Mock()
+    response.content = json.dumps({"access_token": token, "expires_in": expires_in}).encode("utf-8")
+    return response
+
+
+class TokenCacheTests(unittest.TestCase):
+    def test_access_token_is_persisted_and_reused(self) -> None:
+        with TemporaryDirectory() as tmp:
+            cache_path = Path(tmp) / "token.json"
+
+            first = BaiduOcrClient("api-key", "secret-key", token_cache_path=cache_path)
+            with mock.patch.object(first._session, "post", return_value=_token_response("token-1")) as post:
+                self.assertEqual(first._get_access_token(), "token-1")
+            post.assert_called_once()
+
+            stored = json.loads(cache_path.read_text(encoding="utf-8"))
+            self.assertEqual(stored["token"], "token-1")
+            self.assertNotIn("api-key", cache_path.read_text(encoding="utf-8"))
+
+            second = BaiduOcrClient("api-key", "secret-key", token_cache_path=cache_path)
+            with mock.patch.object(second._session, "post") as post:
+                self.assertEqual(second._get_access_token(), "token-1")
+            post.assert_not_called()
+
+    def test_persisted_token_is_ignored_for_other_keys(self) -> None:
+        with TemporaryDirectory() as tmp:
+            cache_path = Path(tmp) / "token.json"
+
+            first = BaiduOcrClient("api-key", "secret-key", token_cache_path=cache_path)
+            with mock.patch.object(first._session, "post", return_value=_token_response("token-1")):
+                first._get_access_token()
+
+            other = BaiduOcrClient("other-key", "secret-key", token_cache_path=cache_path)
+            with mock.patch.object(other._session, "post", return_value=_token_response("token-2")) as post:
+                self.assertEqual(other._get_access_token(), "token-2")
+            post.assert_called_once()
+
+    def test_concurrent_callers_share_one_token_fetch(self) -> None:
+        with TemporaryDirectory() as tmp:
+            cache_path = Path(tmp) / "token.json"
+            client = BaiduOcrClient("api-key", "secret-key", token_cache_path=cache_path)
+
+            def slow_post(*_args: object, **_kwargs: object) -> mock.Mock:
+                # Keep the first fetch in flight while the other callers arrive.
+                time.sleep(0.2)
+                return _token_response("token-1")
+
+            with mock.patch.object(client._session, "post", side_effect=slow_post) as post:
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    tokens = list(executor.map(lambda _: client._get_access_token(), range(4)))
+
+            self.assertEqual(tokens, ["token-1"] * 4)
+            post.assert_called_once()
+            self.assertEqual(json.loads(cache_path.read_text(encoding="utf-8"))["token"], "token-1")
+            self.assertEqual(os.listdir(tmp), ["token.json"])
+
+    def test_rejected_token_is_dropped_and_request_retried(self) -> None:
+        with TemporaryDirectory() as tmp:
+            cache_path = Path(tmp) / "token.json"
+            first = BaiduOcrClient("api-key", "secret-key", token_cache_path=cache_path)
+            with mock.patch.object(first._session, "post", return_value=_token_response("stale")):
+                first._get_access_token()
+
+            client = BaiduOcrClient("api-key", "secret-key", token_cache_path=cache_path)
+            rejected = mock.Mock(content=json.dumps({"error_code": 110, "error_msg": "Access token invalid"}).encode())
+            words = mock.Mock(content=json.dumps({"words_result": [{"words": "标题"}]}).encode())
+            with mock.patch.object(
+                client._session, "post", side_effect=[rejected, _token_response("fresh"), words]
+            ) as post:
+                self.assertEqual(client.recognize(b"image", endpoint="general_basic"), "标题")
+
+            self.assertEqual(post.call_args_list[0].kwargs["params"], {"access_token": "stale"})
+            self.assertEqual(post.call_args_list[2].kwargs["params"], {"access_token": "fresh"})
+            self.assertEqual(json.loads(cache_path.read_text(encoding="utf-8"))["token"], "fresh")
+
+
+class RecognizeFutureTests(unittest.TestCase):
+    def test_recognize_future_runs_on_client_pool(self) -> None:
+        client = BaiduOcrClient("api-key", "secret-key", persist_token=False)
+        try:
+            with mock.patch.object(client, "recognize", return_value="标题") as recognize:
+                future = client.recognize_future(b"image", endpoint="general_basic")
+                self.assertEqual(future.result(timeout=5), "标题")
+            recognize.assert_called_once_with(
+                b"image",
+                endpoint="general_basic",
+                language_type="CHN_ENG",
+                detect_direction=False,
+            )
+        finally:
+            client.close()
+
+
+def _noise_image_bytes(size: tuple[int, int], image_format: str, **save_kwargs: object) -> bytes:
+    image = Image.frombytes("RGB", size, os.urandom(size[0] * size[1] * 3))
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, **save_kwargs)
+    return buffer.getvalue()
+
+
+class CompressImageTests(unittest.TestCase):
+    def test_jpeg_dimensions_reads_header(self) -> None:
+        data = _noise_image_bytes((321, 123), "JPEG")
+        self.assertEqual(_jpeg_dimensions(data), (321, 123))
+        self.assertIsNone(_jpeg_dimensions(_noise_image_bytes((8, 8), "PNG")))
+
+    def test_small_jpeg_is_returned_unchanged(self) -> None:
+        data = _noise_image_bytes((1600, 1000), "JPEG", quality=100)
+        self.assertGreater(len(data), 2_000_000)
+        self.assertIs(_maybe_compress_image_for_ocr(data), data)
+
+    def test_large_png_is_downscaled_to_jpeg(self) -> None:
+        data = _noise_image_bytes((2400, 1200), "PNG")
+        compressed = _maybe_compress_image_for_ocr(data)
+        self.assertLess(len(compressed), len(data))
+        self.assertEqual(Image.open(io.BytesIO(compressed)).size, (1600, 800))
+
+    def test_decoded_frame_is_encoded_without_mutating_it(self) -> None:
+        frame = Image.new("RGBA", (3200, 1800), (10, 20, 30, 255))
+        encoded = _encode_frame_for_ocr(frame)
+        self.assertEqual(frame.size, (3200, 1800))
+        decoded = Image.open(io.BytesIO(encoded))
+        self.assertEqual(decoded.format, "JPEG")
+        self.assertEqual(decoded.size, (1600, 900))
+
+
+class FormBodyTests(unittest.TestCase):
+    def test_form_body_round_trips_base64_image(self) -> None:
+        image_bytes = bytes(range(256)) * 3
+        body = _build_ocr_form_body(image_bytes, language_type="CHN_ENG", detect_direction=False)
+
+        fields = parse_qs(body.decode("ascii"), strict_parsing=True)
+        self.assertEqual(fields["image"], [base64.b64encode(image_bytes).decode("ascii")])
+        self.assertEqual(fields["language_type"], ["CHN_ENG"])
+        self.assertEqual(fields["detect_direction"], ["false"])
+
+
+if __name__ == "__main__":
+    unittest.main()
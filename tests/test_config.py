@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import time
+import unittest
+from dataclasses import replace
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from videotitler.config import ConfigStore, load_config, save_config
+
+
+class ConfigStoreTests(unittest.TestCase):
+    def test_rapid_changes_are_written_once(self) -> None:
+        with TemporaryDirectory() as tmp:
+            config_path = Path(tmp) / "config.json"
+            store = ConfigStore(config_path, delay_s=0.05)
+
+            with mock.patch("videotitler.config.save_config", wraps=save_config) as save:
+                store.set("frame_number_1based", 3)
+                store.set("dry_run", True)
+                store.set("start_index", 7)
+                time.sleep(0.3)
+
+            save.assert_called_once()
+            loaded = load_config(config_path)
+            self.assertEqual(loaded.frame_number_1based, 3)
+            self.assertTrue(loaded.dry_run)
+            self.assertEqual(loaded.start_index, 7)
+
+    def test_close_flushes_pending_changes(self) -> None:
+        with TemporaryDirectory() as tmp:
+            config_path = Path(tmp) / "config.json"
+            store = ConfigStore(config_path, delay_s=60)
+
+            store.set("index_padding", 5)
+            self.assertFalse(config_path.exists())
+
+            store.close()
+            self.assertEqual(load_config(config_path).index_padding, 5)
+            self.assertFalse((Path(tmp) / "config.json.tmp").exists())
+
+    def test_replaced_config_is_written_on_close(self) -> None:
+        with TemporaryDirectory() as tmp:
+            config_path = Path(tmp) / "config.json"
+            store = ConfigStore(config_path, delay_s=60)
+
+            store.replace(replace(store.config, start_index=9))
+            store.mark_dirty()
+            store.close()
+            self.assertEqual(load_config(config_path).start_index, 9)
+
+    def test_unknown_field_is_rejected(self) -> None:
+        with TemporaryDirectory() as tmp:
+            store = ConfigStore(Path(tmp) / "config.json")
+            with self.assertRaises(AttributeError):
+                store.set("not_a_field", 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
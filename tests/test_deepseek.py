@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+import unittest
+from unittest import mock
+
+from videotitler import deepseek
+from videotitler.deepseek import _clean_title, extract_title_sentence
+from videotitler.net import RateLimiter
+
+
+def _chat_response(content: str) -> mock.Mock:
+    response = mock.Mock()
+    response.content = json.dumps({"choices": [{"message": {"content": content}}]}).encode("utf-8")
+    return response
+
+
+class CleanTitleTests(unittest.TestCase):
+    def test_strips_quotes_whitespace_and_prefix(self) -> None:
+        self.assertEqual(_clean_title("“标题：打开宝箱”"), "打开宝箱")
+        self.assertEqual(_clean_title('Title: "Go left"'), "Go left")
+        self.assertEqual(_clean_title(" 　跳跃到平台上 "), "跳跃到平台上")
+
+    def test_keeps_inner_quotes(self) -> None:
+        self.assertEqual(_clean_title('按下"E"键'), '按下"E"键')
+
+
+class ExtractTitleSentenceTests(unittest.TestCase):
+    def setUp(self) -> None:
+        deepseek._TITLE_CACHE.clear()
+        self.session = mock.Mock()
+        endpoint = deepseek._Endpoint(session=self.session, rate_limiter=RateLimiter(0))
+        patcher = mock.patch("videotitler.deepseek._get_endpoint", return_value=endpoint)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _extract(self, ocr_text: str, **kwargs: object) -> str:
+        return extract_title_sentence(
+            api_key="deepseek-key",
+            base_url="https://api.deepseek.com/v1",
+            model="deepseek-chat",
+            ocr_text=ocr_text,
+            system_prompt="system",
+            user_prompt_template="user {ocr_text}",
+            **kwargs,
+        )
+
+    def test_repeated_ocr_text_is_served_from_cache(self) -> None:
+        self.session.post.return_value = _chat_response("向左走到尽头然后跳过去拿到钥匙")
+        ocr_text = "第一行\n向左走到尽头然后跳过去拿到钥匙\n第三行"
+
+        self.assertEqual(self._extract(ocr_text), "向左走到尽头然后跳过去拿到钥匙")
+        self.assertEqual(self._extract(ocr_text), "向左走到尽头然后跳过去拿到钥匙")
+        self.session.post.assert_called_once()
+
+        self._extract(ocr_text, use_cache=False)
+        self.assertEqual(self.session.post.call_count, 2)
+
+    def test_single_short_line_skips_the_model(self) -> None:
+        self.assertEqual(self._extract("  “跳上左边的平台”\n\n"), "跳上左边的平台")
+        self.session.post.assert_not_called()
+
+    def test_sentence_or_multi_line_text_still_uses_the_model(self) -> None:
+        self.session.post.return_value = _chat_response("跳上平台")
+
+        self._extract("跳上平台。")
+        self._extract("跳上平台\n按下空格")
+        self._extract("跳上平台", fast_path=False)
+        self.assertEqual(self.session.post.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+import requests
+
+from videotitler.net import RateLimitedError, RateLimiter, retry_with_backoff
+
+
+def _http_error(status_code: int, *, body: bytes = b"{}", headers: dict[str, str] | None = None) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    response.headers.update(headers or {})
+    return requests.HTTPError(f"{status_code} error", response=response)
+
+
+class RetryWithBackoffTests(unittest.TestCase):
+    def test_honors_retry_after_on_429(self) -> None:
+        calls: list[int] = []
+
+        def attempt() -> str:
+            calls.append(1)
+            if len(calls) == 1:
+                raise _http_error(429, headers={"Retry-After": "3"})
+            return "ok"
+
+        with mock.patch("videotitler.net.time.sleep") as sleep:
+            self.assertEqual(retry_with_backoff(attempt, retries=2), "ok")
+
+        delay = sleep.call_args.args[0]
+        self.assertGreaterEqual(delay, 3.0)
+        self.assertLessEqual(delay, 3.3)
+
+    def test_caps_retry_after(self) -> None:
+        attempts = iter([_http_error(429, headers={"Retry-After": "600"})])
+
+        def attempt() -> str:
+            for exc in attempts:
+                raise exc
+            return "ok"
+
+        with mock.patch("videotitler.net.time.sleep") as sleep:
+            retry_with_backoff(attempt, retries=2, cap_s=10.0)
+
+        self.assertLessEqual(sleep.call_args.args[0], 11.0)
+
+    def test_quota_text_in_body_is_treated_as_rate_limit(self) -> None:
+        attempts = iter([_http_error(403, body=b'{"error": "Quota exceeded"}')])
+
+        def attempt() -> str:
+            for exc in attempts:
+                raise exc
+            return "ok"
+
+        with mock.patch("videotitler.net.time.sleep") as sleep:
+            self.assertEqual(retry_with_backoff(attempt, retries=2), "ok")
+        sleep.assert_called_once()
+
+    def test_client_errors_are_not_retried(self) -> None:
+        def attempt() -> str:
+            raise _http_error(401)
+
+        with mock.patch("videotitler.net.time.sleep") as sleep:
+            with self.assertRaises(requests.HTTPError):
+                retry_with_backoff(attempt, retries=3)
+        sleep.assert_not_called()
+
+    def test_payload_rate_limit_is_retried_then_reraised(self) -> None:
+        def attempt() -> str:
+            raise RateLimitedError("qps limit")
+
+        with mock.patch("videotitler.net.time.sleep") as sleep:
+            with self.assertRaises(RateLimitedError):
+                retry_with_backoff(attempt, retries=3, min_wait_s=0.5)
+        self.assertEqual(sleep.call_count, 2)
+        self.assertGreaterEqual(sleep.call_args_list[0].args[0], 0.5)
+
+
+class RateLimiterTests(unittest.TestCase):
+    def test_sends_are_spaced_one_interval_apart(self) -> None:
+        clock = [100.0]
+        sleeps: list[float] = []
+
+        def sleep(delay: float) -> None:
+            sleeps.append(delay)
+            clock[0] += delay
+
+        limiter = RateLimiter(4.0)
+        with mock.patch("videotitler.net.time.monotonic", side_effect=lambda: clock[0]), mock.patch(
+            "videotitler.net.time.sleep", side_effect=sleep
+        ):
+            send_times = []
+            for _ in range(3):
+                limiter.acquire()
+                send_times.append(clock[0])
+
+            # An idle gap longer than the interval does not bank extra sends.
+            clock[0] += 1.0
+            limiter.acquire()
+            send_times.append(clock[0])
+
+        self.assertEqual(send_times, [100.0, 100.25, 100.5, 101.5])
+        self.assertEqual(sleeps, [0.25, 0.25])
+
+    def test_zero_rate_never_sleeps(self) -> None:
+        limiter = RateLimiter(0)
+        with mock.patch("videotitler.net.time.sleep") as sleep:
+            for _ in range(3):
+                limiter.acquire()
+        sleep.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
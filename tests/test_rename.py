@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from videotitler.rename import (
+    DirectoryNames,
+    build_target_path,
+    build_target_path_fast,
+    index_prefix_format,
+    pick_non_conflicting_path,
+    sanitize_filename_component,
+)
+
+
+class SanitizeFilenameComponentTests(unittest.TestCase):
+    def test_invalid_and_control_characters_become_single_spaces(self) -> None:
+        self.assertEqual(sanitize_filename_component('走到 <门口>:\t打开\x01"宝箱"?'), "走到 门口 打开 宝箱")
+
+    def test_zero_width_space_and_trailing_dots_are_removed(self) -> None:
+        self.assertEqual(sanitize_filename_component("​跳跃​攻击..."), "跳跃 攻击")
+
+    def test_empty_result_uses_fallback_and_length_is_capped(self) -> None:
+        self.assertEqual(sanitize_filename_component(" ?* "), "标题")
+        self.assertEqual(sanitize_filename_component("a" * 100, max_len=10), "a" * 10)
+
+
+class BuildTargetPathTests(unittest.TestCase):
+    def test_fast_path_matches_convenience_wrapper(self) -> None:
+        src = Path("videos") / "clip.MP4"
+        expected = build_target_path(src, index=7, index_padding=3, title="打开: 宝箱")
+        fast = build_target_path_fast(src, index_prefix_format(3).format(7), sanitize_filename_component("打开: 宝箱"))
+        self.assertEqual(fast, expected)
+        self.assertEqual(expected, Path("videos") / "007-打开 宝箱.MP4")
+        self.assertEqual(index_prefix_format(0).format(12), "12")
+
+
+class PickNonConflictingPathTests(unittest.TestCase):
+    def test_directory_names_snapshot_matches_stat_based_lookup(self) -> None:
+        with TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            (directory / "001-标题.mp4").write_bytes(b"")
+            (directory / "001-标题_2.mp4").write_bytes(b"")
+            target = directory / "001-标题.mp4"
+
+            names = DirectoryNames()
+            expected = pick_non_conflicting_path(target)
+            with mock.patch.object(Path, "exists", autospec=True, return_value=False) as exists:
+                self.assertEqual(names.pick_non_conflicting_path(target), expected)
+                self.assertEqual(expected.name, "001-标题_3.mp4")
+                # Candidates come from the snapshot; only the picked one is stat'ed.
+                exists.assert_called_once_with(expected)
+
+                names.record_rename(directory / "001-标题.mp4", directory / "001-标题_3.mp4")
+                self.assertEqual(names.pick_non_conflicting_path(target), target)
+
+    def test_file_created_after_snapshot_is_not_overwritten(self) -> None:
+        with TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            (directory / "clip.mp4").write_bytes(b"")
+            target = directory / "001-标题.mp4"
+
+            names = DirectoryNames()
+            names.names_in(directory)
+            target.write_bytes(b"")
+            (directory / "001-标题_2.mp4").write_bytes(b"")
+
+            picked = names.pick_non_conflicting_path(target, ignore_path=directory / "clip.mp4")
+            self.assertEqual(picked.name, "001-标题_3.mp4")
+            self.assertFalse(picked.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
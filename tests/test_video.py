@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import io
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from PIL import Image
+
+from videotitler import video
+from videotitler.video import LazyPNG, VideoFrameError, _image_from_ppm, _run_ffmpeg
+
+
+class LazyPNGTests(unittest.TestCase):
+    def test_png_is_encoded_once_on_demand(self) -> None:
+        image = Image.new("RGB", (32, 16), (200, 100, 50))
+        with mock.patch.object(image, "save", wraps=image.save) as save:
+            png = LazyPNG(image)
+            save.assert_not_called()
+
+            data = bytes(png)
+            self.assertIs(bytes(png), data)
+            save.assert_called_once()
+
+        decoded = Image.open(io.BytesIO(data))
+        self.assertEqual(decoded.format, "PNG")
+        self.assertEqual(decoded.size, (32, 16))
+
+
+class ImageFromPpmTests(unittest.TestCase):
+    def test_binary_ppm_round_trips(self) -> None:
+        image = Image.frombytes("RGB", (7, 5), os.urandom(7 * 5 * 3))
+        buffer = io.BytesIO()
+        image.save(buffer, format="PPM")
+
+        decoded = _image_from_ppm(bytearray(buffer.getvalue()))
+        self.assertEqual(decoded.mode, "RGB")
+        self.assertEqual(decoded.tobytes(), image.tobytes())
+
+    def test_non_rgb_ppm_falls_back_to_pillow(self) -> None:
+        image = Image.new("L", (4, 3), 128)
+        buffer = io.BytesIO()
+        image.save(buffer, format="PPM")
+
+        decoded = _image_from_ppm(buffer.getvalue())
+        self.assertEqual(decoded.mode, "L")
+        self.assertEqual(decoded.size, (4, 3))
+
+
+class ProbeFrameRateTests(unittest.TestCase):
+    def setUp(self) -> None:
+        video._FRAME_RATE_CACHE.clear()
+
+    def test_frame_rate_is_cached_until_file_changes(self) -> None:
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "clip.mp4"
+            path.write_bytes(b"")
+            completed = subprocess.CompletedProcess(
+                [], 0, stdout=b"r_frame_rate=30000/1001\navg_frame_rate=30000/1001\n", stderr=b""
+            )
+
+            with mock.patch.object(video, "_find_ffprobe", return_value="ffprobe"), mock.patch.object(
+                video.subprocess, "run", return_value=completed
+            ) as run:
+                self.assertAlmostEqual(video._probe_frame_rate(path), 29.97, places=2)
+                self.assertAlmostEqual(video._probe_frame_rate(path), 29.97, places=2)
+                run.assert_called_once()
+
+                stat = path.stat()
+                os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+                video._probe_frame_rate(path)
+                self.assertEqual(run.call_count, 2)
+
+    def test_average_rate_is_preferred_over_r_frame_rate(self) -> None:
+        self.assertEqual(video._parse_frame_rate("r_frame_rate=60/1\navg_frame_rate=30/1\n"), 30.0)
+        self.assertAlmostEqual(
+            video._parse_frame_rate("r_frame_rate=30000/1001\navg_frame_rate=0/0\n"), 29.97, places=2
+        )
+        self.assertIsNone(video._parse_frame_rate("r_frame_rate=0/0\navg_frame_rate=0/0\n"))
+        self.assertIsNone(video._parse_frame_rate(""))
+
+
+class RunFfmpegTests(unittest.TestCase):
+    def _python(self, code: str) -> list[str]:
+        return [sys.executable, "-c", code]
+
+    def test_large_stderr_does_not_block_stdout(self) -> None:
+        code = (
+            "import sys\n"
+            "for i in range(20000): sys.stderr.write('warning %d\\n' % i)\n"
+            "sys.stdout.buffer.write(b'x' * 3_000_000)\n"
+        )
+        self.assertEqual(len(_run_ffmpeg(self._python(code), timeout_s=30)), 3_000_000)
+
+    def test_failure_reports_stderr_tail(self) -> None:
+        code = "import sys\nsys.stderr.write('first\\nlast error\\n')\nsys.exit(1)\n"
+        with self.assertRaisesRegex(VideoFrameError, "last error"):
+            _run_ffmpeg(self._python(code), timeout_s=30)
+
+    def test_timeout_kills_process(self) -> None:
+        with self.assertRaisesRegex(VideoFrameError, "超时"):
+            _run_ffmpeg(self._python("import time\ntime.sleep(30)\n"), timeout_s=0.5)
+
+
+class WarmUpFfmpegTests(unittest.TestCase):
+    def test_missing_ffmpeg_is_reported_and_not_cached(self) -> None:
+        video._find_ffmpeg.cache_clear()
+        with mock.patch.object(video, "_safe_which", return_value=None):
+            self.assertFalse(video.warm_up_ffmpeg())
+        with mock.patch.object(video, "_safe_which", return_value="/opt/ffmpeg"), mock.patch.object(
+            video.subprocess, "run", return_value=subprocess.CompletedProcess([], 0, b"", b"")
+        ) as run:
+            self.assertTrue(video.warm_up_ffmpeg())
+        self.assertEqual(run.call_args.args[0][0], "/opt/ffmpeg")
+        video._find_ffmpeg.cache_clear()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,31 @@
 from __future__ import annotations
 
 import base64
+import functools
+import hashlib
 import io
+import json
+import math
+import os
+import struct
+import tempfile
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Union
+from urllib.parse import urlencode
 
-import requests
+from videotitler import jsonio
+from videotitler.net import RateLimitedError, RateLimiter, create_session, retry_with_backoff
+
+if TYPE_CHECKING:
+    import numpy as np
+    from PIL import Image
+
+    # Encoded image bytes, or an already decoded frame (PIL image / HxW[xC] uint8 array).
+    OcrImage = Union[bytes, Image.Image, np.ndarray]
 
 
 class BaiduOcrError(RuntimeError):
@@ -15,6 +35,89 @@ class BaiduOcrError(RuntimeError):
 _OCR_GENERAL_BASIC_URL = "https://aip.baidubce.com/rest/2.0/ocr/v1/general_basic"
 _OCR_ACCURATE_BASIC_URL = "https://aip.baidubce.com/rest/2.0/ocr/v1/accurate_basic"
 
+# Payload-level throttling: 4 = cluster over limit, 18 = QPS limit reached.
+# 17/19 (daily/total quota exhausted) cannot recover within a retry window.
+_RATE_LIMIT_ERROR_CODES = {4, 18}
+# 110 = access token invalid, 111 = access token expired: fetch a new one and retry.
+_INVALID_TOKEN_ERROR_CODES = {110, 111}
+
+
+_JPEG_QUALITY = 88
+_OCR_MAX_SIDE = 1600
+
+
+@functools.lru_cache(maxsize=1)
+def _get_turbojpeg() -> object | None:
+    # Optional: PyTurboJPEG (libjpeg-turbo SIMD encoder). Falls back to Pillow when missing.
+    try:
+        from turbojpeg import TurboJPEG
+
+        return TurboJPEG()
+    except Exception:
+        return None
+
+
+def _encode_jpeg(image: object) -> bytes:
+    turbo = _get_turbojpeg()
+    if turbo is not None:
+        try:
+            import numpy as np
+            from turbojpeg import TJPF_GRAY, TJPF_RGB, TJSAMP_420, TJSAMP_GRAY
+
+            if image.mode == "L":  # type: ignore[attr-defined]
+                pixel_format, subsample = TJPF_GRAY, TJSAMP_GRAY
+            else:
+                pixel_format, subsample = TJPF_RGB, TJSAMP_420
+            return turbo.encode(  # type: ignore[attr-defined]
+                np.asarray(image),
+                quality=_JPEG_QUALITY,
+                pixel_format=pixel_format,
+                jpeg_subsample=subsample,
+            )
+        except Exception:
+            pass
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=_JPEG_QUALITY)  # type: ignore[attr-defined]
+    return buffer.getvalue()
+
+
+# SOFn markers carry the frame size; C4/C8/CC share the range but are DHT/JPG/DAC.
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _jpeg_dimensions(data: bytes) -> tuple[int, int] | None:
+    """Read (width, height) from a JPEG header without decoding any pixels."""
+    if data[:3] != b"\xff\xd8\xff":
+        return None
+
+    offset = 2
+    size = len(data)
+    while offset + 4 <= size:
+        if data[offset] != 0xFF:
+            return None
+        marker = data[offset + 1]
+        if marker == 0xFF:
+            # Fill byte before a marker.
+            offset += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9:
+            # Standalone markers without a length field.
+            offset += 2
+            continue
+
+        (length,) = struct.unpack_from(">H", data, offset + 2)
+        if marker in _JPEG_SOF_MARKERS:
+            if offset + 9 > size:
+                return None
+            height, width = struct.unpack_from(">HH", data, offset + 5)
+            return width, height
+        if marker == 0xDA:
+            # Start of scan reached without a frame header.
+            return None
+        offset += 2 + length
+    return None
+
 
 def _maybe_compress_image_for_ocr(image_bytes: bytes) -> bytes:
     # Large PNGs (e.g. 4K frames) can cause slow uploads and timeouts.
@@ -22,6 +125,11 @@ def _maybe_compress_image_for_ocr(image_bytes: bytes) -> bytes:
     if len(image_bytes) <= 2_000_000:
         return image_bytes
 
+    # A JPEG that already fits would barely shrink: skip the decode/encode round trip.
+    jpeg_size = _jpeg_dimensions(image_bytes)
+    if jpeg_size is not None and max(jpeg_size) <= _OCR_MAX_SIDE:
+        return image_bytes
+
     try:
         from PIL import Image
     except Exception:
@@ -29,17 +137,22 @@ def _maybe_compress_image_for_ocr(image_bytes: bytes) -> bytes:
 
     try:
         image = Image.open(io.BytesIO(image_bytes))
-        image.load()
+        max_side = _OCR_MAX_SIDE
+        width, height = image.size
+        if image.format == "JPEG" and max(width, height) > max_side:
+            # Let libjpeg decode at 1/2, 1/4 or 1/8 scale in the DCT domain while
+            # staying >= the final size, instead of decoding full resolution first.
+            ratio = max_side / max(width, height)
+            image.draft("RGB", (math.ceil(width * ratio), math.ceil(height * ratio)))
+        # No explicit load(): convert()/thumbnail()/encode decode lazily at the
+        # reduced size, and a truncated input still falls back to the original bytes below.
         if image.mode not in {"RGB", "L"}:
             image = image.convert("RGB")
 
-        max_side = 1600
         if max(image.size) > max_side:
             image.thumbnail((max_side, max_side))
 
-        buffer = io.BytesIO()
-        image.save(buffer, format="JPEG", quality=88, optimize=True)
-        jpeg_bytes = buffer.getvalue()
+        jpeg_bytes = _encode_jpeg(image)
         if jpeg_bytes and len(jpeg_bytes) < len(image_bytes):
             return jpeg_bytes
     except Exception:
@@ -48,12 +161,105 @@ def _maybe_compress_image_for_ocr(image_bytes: bytes) -> bytes:
     return image_bytes
 
 
+def _encode_frame_for_ocr(frame: Image.Image | np.ndarray) -> bytes:
+    """
+    JPEG-encode a decoded frame for upload, downscaled to _OCR_MAX_SIDE.
+
+    Unlike _maybe_compress_image_for_ocr this never round-trips through PNG:
+    the pixels go straight from the decoder into the JPEG encoder.
+    """
+    from PIL import Image, ImageOps
+
+    image = frame if isinstance(frame, Image.Image) else Image.fromarray(frame)
+    if image.mode not in {"RGB", "L"}:
+        image = image.convert("RGB")
+    if max(image.size) > _OCR_MAX_SIDE:
+        # contain() returns a new image, so the caller's frame is left untouched.
+        image = ImageOps.contain(image, (_OCR_MAX_SIDE, _OCR_MAX_SIDE))
+    return _encode_jpeg(image)
+
+
+def _prepare_ocr_image(image: OcrImage) -> bytes:
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return _maybe_compress_image_for_ocr(bytes(image))
+    return _encode_frame_for_ocr(image)
+
+
+def _build_ocr_form_body(image_bytes: bytes, *, language_type: str, detect_direction: bool) -> bytes:
+    # Build the urlencoded body once, on bytes: base64 only needs "+", "/" and "="
+    # escaped, which avoids the str copy and requests' per-character form encoding.
+    image_field = (
+        base64.b64encode(image_bytes)
+        .replace(b"+", b"%2B")
+        .replace(b"/", b"%2F")
+        .replace(b"=", b"%3D")
+    )
+    options = urlencode(
+        {
+            "language_type": language_type,
+            "detect_direction": "true" if detect_direction else "false",
+        }
+    )
+    return b"".join((b"image=", image_field, b"&", options.encode("ascii")))
+
+
 @dataclass(slots=True)
 class _TokenCache:
     token: str = ""
     expires_at_epoch: float = 0.0
 
 
+def default_token_cache_path() -> Path:
+    return Path.home() / ".videotitler" / "token.json"
+
+
+def _key_fingerprint(api_key: str, secret_key: str) -> str:
+    # Only a hash of the credentials is written to disk, never the keys themselves.
+    return hashlib.sha256(f"{api_key}\n{secret_key}".encode("utf-8")).hexdigest()[:16]
+
+
+def _load_persisted_token(path: Path, fingerprint: str) -> _TokenCache:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("fingerprint") != fingerprint:
+            return _TokenCache()
+        token = str(data.get("token") or "")
+        expires_at_epoch = float(data.get("expires_at_epoch") or 0.0)
+    except Exception:
+        return _TokenCache()
+
+    if not token or time.time() >= expires_at_epoch:
+        return _TokenCache()
+    return _TokenCache(token=token, expires_at_epoch=expires_at_epoch)
+
+
+def _persist_token(path: Path, fingerprint: str, cache: _TokenCache) -> None:
+    data = {
+        "fingerprint": fingerprint,
+        "token": cache.token,
+        "expires_at_epoch": cache.expires_at_epoch,
+    }
+    tmp_path: str | None = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # A unique temp file per writer (created 0600), so concurrent clients
+        # never interleave writes before the atomic replace.
+        fd, tmp_path = tempfile.mkstemp(prefix=f"{path.name}.", suffix=".tmp", dir=path.parent)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(json.dumps(data))
+        os.replace(tmp_path, path)
+        tmp_path = None
+    except OSError:
+        # The on-disk cache is an optimization only.
+        pass
+    finally:
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
 class BaiduOcrClient:
     def __init__(
         self,
@@ -62,63 +268,119 @@ class BaiduOcrClient:
         *,
         timeout_s: int = 60,
         retries: int = 2,
+        qps: float = 2.0,
+        max_workers: int = 4,
+        persist_token: bool = True,
+        token_cache_path: Path | None = None,
+        http2: bool = False,
     ) -> None:
         self._api_key = api_key.strip()
         self._secret_key = secret_key.strip()
         self._timeout_s = max(5, int(timeout_s))
         self._retries = max(1, int(retries))
-        self._token_cache = _TokenCache()
+        self._fingerprint = _key_fingerprint(self._api_key, self._secret_key)
+        self._token_cache_path = (token_cache_path or default_token_cache_path()) if persist_token else None
+        self._token_cache = (
+            _load_persisted_token(self._token_cache_path, self._fingerprint)
+            if self._token_cache_path is not None
+            else _TokenCache()
+        )
+        # Serializes token refreshes: concurrent recognize() calls share one OAuth fetch.
+        self._token_lock = threading.Lock()
+        self._session = create_session(http2=http2)
+        self._rate_limiter = RateLimiter(qps)
+        self._max_workers = max(1, int(max_workers))
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created on first use and kept for the client's lifetime.
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="baiduocr",
+                )
+            return self._executor
+
+    def close(self) -> None:
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._session.close()
 
     def _get_access_token(self) -> str:
-        now = time.time()
-        if self._token_cache.token and now < self._token_cache.expires_at_epoch:
-            return self._token_cache.token
+        cache = self._token_cache
+        if cache.token and time.time() < cache.expires_at_epoch:
+            return cache.token
+
+        with self._token_lock:
+            # Another thread may have refreshed the token while this one waited.
+            cache = self._token_cache
+            if cache.token and time.time() < cache.expires_at_epoch:
+                return cache.token
+            return self._fetch_access_token()
+
+    def _invalidate_access_token(self, token: str) -> None:
+        with self._token_lock:
+            if self._token_cache.token != token:
+                # Already replaced by another thread.
+                return
+            self._token_cache = _TokenCache()
+            if self._token_cache_path is not None:
+                try:
+                    self._token_cache_path.unlink(missing_ok=True)
+                except OSError:
+                    pass
 
+    def _fetch_access_token(self) -> str:
+        now = time.time()
         if not self._api_key or not self._secret_key:
             raise BaiduOcrError("缺少百度 OCR 的 API Key / Secret Key。")
 
+        import requests
+
         url = "https://aip.baidubce.com/oauth/2.0/token"
-        last_exc: Exception | None = None
-        for attempt in range(self._retries):
-            try:
-                response = requests.post(
-                    url,
-                    data={
-                        "grant_type": "client_credentials",
-                        "client_id": self._api_key,
-                        "client_secret": self._secret_key,
-                    },
-                    timeout=self._timeout_s,
-                )
-                response.raise_for_status()
-                payload = response.json()
-                break
-            except requests.RequestException as exc:
-                last_exc = exc
-                if attempt + 1 >= self._retries:
-                    raise BaiduOcrError(f"获取 access_token 失败（网络超时/连接）：{exc}") from exc
-                time.sleep(1.0 * (2**attempt))
-            except ValueError as exc:
-                raise BaiduOcrError("获取 access_token 失败：返回不是 JSON。") from exc
-        else:  # pragma: no cover
-            raise BaiduOcrError(f"获取 access_token 失败：{last_exc}")
+
+        def fetch() -> dict:
+            response = self._session.post(
+                url,
+                data={
+                    "grant_type": "client_credentials",
+                    "client_id": self._api_key,
+                    "client_secret": self._secret_key,
+                },
+                timeout=self._timeout_s,
+            )
+            response.raise_for_status()
+            return jsonio.loads(response.content)  # type: ignore[return-value]
+
+        try:
+            payload = retry_with_backoff(fetch, retries=self._retries)
+        except requests.RequestException as exc:
+            raise BaiduOcrError(f"获取 access_token 失败（网络超时/连接）：{exc}") from exc
+        except ValueError as exc:
+            raise BaiduOcrError("获取 access_token 失败：返回不是 JSON。") from exc
 
         token = payload.get("access_token")
         expires_in = int(payload.get("expires_in", 0))
         if not token:
             raise BaiduOcrError(f"获取 access_token 失败：{payload!r}")
 
-        # Refresh 60s earlier.
-        self._token_cache.token = token
-        self._token_cache.expires_at_epoch = now + max(0, expires_in - 60)
+        # Refresh 60s earlier. Swap in a new object so lock-free readers never
+        # see a new token paired with the old expiry.
+        self._token_cache = _TokenCache(token=token, expires_at_epoch=now + max(0, expires_in - 60))
+        if self._token_cache_path is not None:
+            _persist_token(self._token_cache_path, self._fingerprint, self._token_cache)
         return token
 
     def general_basic(
         self,
-        image_bytes: bytes,
+        image_bytes: OcrImage,
         *,
         language_type: str = "CHN_ENG",
-        detect_direction: bool = True,
+        detect_direction: bool = False,
     ) -> str:
         return self.recognize(
             image_bytes,
@@ -129,10 +391,10 @@ class BaiduOcrClient:
 
     def accurate_basic(
         self,
-        image_bytes: bytes,
+        image_bytes: OcrImage,
         *,
         language_type: str = "CHN_ENG",
-        detect_direction: bool = True,
+        detect_direction: bool = False,
     ) -> str:
         return self.recognize(
             image_bytes,
@@ -141,18 +403,40 @@ class BaiduOcrClient:
             detect_direction=detect_direction,
         )
 
+    def recognize_future(
+        self,
+        image_bytes: OcrImage,
+        *,
+        endpoint: str = "accurate_basic",
+        language_type: str = "CHN_ENG",
+        detect_direction: bool = False,
+    ) -> Future[str]:
+        """
+        在客户端的线程池中执行 recognize()（含图片压缩、base64 编码与 JSON 解析），
+        立即返回 Future，调用方线程不被阻塞。
+        """
+        return self._get_executor().submit(
+            self.recognize,
+            image_bytes,
+            endpoint=endpoint,
+            language_type=language_type,
+            detect_direction=detect_direction,
+        )
+
     def recognize(
         self,
-        image_bytes: bytes,
+        image_bytes: OcrImage,
         *,
         endpoint: str = "accurate_basic",
         language_type: str = "CHN_ENG",
-        detect_direction: bool = True,
+        detect_direction: bool = False,
     ) -> str:
         """
+        image_bytes: 图片字节，或已解码的帧（PIL Image / numpy 数组，直接编码为 JPEG）
         endpoint: "accurate_basic"（高精度）或 "general_basic"（通用）
         """
-        token = self._get_access_token()
+        import requests
+
         endpoint = (endpoint or "accurate_basic").strip().lower()
         if endpoint == "accurate_basic":
             url = _OCR_ACCURATE_BASIC_URL
@@ -161,43 +445,53 @@ class BaiduOcrClient:
         else:
             raise BaiduOcrError(f"未知 OCR endpoint：{endpoint}")
 
-        image_bytes = _maybe_compress_image_for_ocr(image_bytes)
-        image_b64 = base64.b64encode(image_bytes).decode("ascii")
+        image_bytes = _prepare_ocr_image(image_bytes)
+        body = _build_ocr_form_body(
+            image_bytes,
+            language_type=language_type,
+            detect_direction=detect_direction,
+        )
+
+        token = ""
 
-        last_exc: Exception | None = None
-        for attempt in range(self._retries):
+        def send() -> dict:
+            self._rate_limiter.acquire()
+            response = self._session.post(
+                url,
+                params={"access_token": token},
+                data=body,
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+                timeout=self._timeout_s,
+            )
+            response.raise_for_status()
+            payload = jsonio.loads(response.content)
+            if payload.get("error_code") in _RATE_LIMIT_ERROR_CODES:
+                raise RateLimitedError(f"OCR 请求被限流：{payload}")
+            return payload
+
+        for attempt in range(2):
+            token = self._get_access_token()
             try:
-                response = requests.post(
-                    url,
-                    params={"access_token": token},
-                    data={
-                        "image": image_b64,
-                        "language_type": language_type,
-                        "detect_direction": "true" if detect_direction else "false",
-                    },
-                    headers={"Content-Type": "application/x-www-form-urlencoded"},
-                    timeout=self._timeout_s,
-                )
-                response.raise_for_status()
-                payload = response.json()
-                break
+                payload = retry_with_backoff(send, retries=self._retries)
+            except RateLimitedError as exc:
+                raise BaiduOcrError(f"OCR 失败：{exc}") from exc
             except requests.RequestException as exc:
-                last_exc = exc
-                if attempt + 1 >= self._retries:
-                    raise BaiduOcrError(f"OCR 请求失败（网络超时/连接）：{exc}") from exc
-                time.sleep(1.0 * (2**attempt))
+                raise BaiduOcrError(f"OCR 请求失败（网络超时/连接）：{exc}") from exc
             except ValueError as exc:
                 raise BaiduOcrError("OCR 失败：返回不是 JSON。") from exc
-        else:  # pragma: no cover
-            raise BaiduOcrError(f"OCR 请求失败：{last_exc}")
+
+            if attempt == 0 and payload.get("error_code") in _INVALID_TOKEN_ERROR_CODES:
+                # A cached (possibly persisted) token was revoked: drop it and retry once.
+                self._invalidate_access_token(token)
+                continue
+            break
 
         if "error_code" in payload:
             raise BaiduOcrError(f"OCR 失败：{payload}")
 
-        words = []
-        for item in payload.get("words_result", []) or []:
-            value = (item or {}).get("words", "")
-            if value:
-                words.append(value)
-
+        words = [
+            item["words"]
+            for item in payload.get("words_result") or ()
+            if isinstance(item, dict) and item.get("words")
+        ]
         return "\n".join(words).strip()
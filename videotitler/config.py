@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-import json
-from dataclasses import asdict, dataclass, field
+import os
+import threading
+from dataclasses import dataclass, field, fields
 from pathlib import Path
 
+from videotitler import jsonio
+
 
 @dataclass(slots=True)
 class AppConfig:
@@ -20,6 +23,8 @@ class AppConfig:
     baidu_api_key: str = ""
     baidu_secret_key: str = ""
     baidu_ocr_mode: str = "accurate_basic"
+    # Fast mode skips Baidu's direction detection (title cards are upright).
+    ocr_fast_mode: bool = True
     deepseek_api_key: str = ""
     deepseek_base_url: str = "https://api.deepseek.com/v1"
     deepseek_model: str = "deepseek-chat"
@@ -38,11 +43,19 @@ class AppConfig:
 
     ui_language: str = "system"
 
+    # Network: HTTP/2 via httpx[http2] when installed (falls back to requests).
+    use_http2: bool = False
+
+    # Videos processed in parallel by the GUI batch run; 0 = auto (half the CPU cores).
+    concurrency: int = 0
+
     # UX
     save_keys_locally: bool = False
     recent_dirs: list[str] = field(default_factory=list)
 
 
+_FIELD_NAMES = tuple(item.name for item in fields(AppConfig))
+
 _NON_SECRET_FIELDS = {
     "input_dir",
     "include_subdirs",
@@ -60,6 +73,17 @@ _NON_SECRET_FIELDS = {
 }
 
 
+def _config_to_dict(config: AppConfig) -> dict[str, object]:
+    # AppConfig is flat, so a shallow field copy replaces asdict()'s recursive deep copy.
+    return {name: getattr(config, name) for name in _FIELD_NAMES}
+
+
+def _write_text_atomic(path: Path, text: str) -> None:
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
 def default_config_path() -> Path:
     return Path.cwd() / "config.json"
 
@@ -69,7 +93,7 @@ def load_config(path: Path) -> AppConfig:
         return AppConfig()
 
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = jsonio.loads(path.read_bytes())
     except Exception:
         return AppConfig()
 
@@ -81,16 +105,13 @@ def load_config(path: Path) -> AppConfig:
 
 
 def save_config(path: Path, config: AppConfig) -> None:
-    data = asdict(config)
+    data = _config_to_dict(config)
     if not config.save_keys_locally:
         data["baidu_api_key"] = ""
         data["baidu_secret_key"] = ""
         data["deepseek_api_key"] = ""
 
-    path.write_text(
-        json.dumps(data, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    _write_text_atomic(path, jsonio.dumps_pretty(data))
 
 
 def load_non_secret_config(path: Path) -> AppConfig:
@@ -104,13 +125,81 @@ def load_non_secret_config(path: Path) -> AppConfig:
 
 def save_non_secret_config(path: Path, config: AppConfig) -> None:
     data = {
-        key: value
-        for key, value in asdict(config).items()
-        if key in _NON_SECRET_FIELDS
+        name: getattr(config, name)
+        for name in _FIELD_NAMES
+        if name in _NON_SECRET_FIELDS
     }
 
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(
-        json.dumps(data, ensure_ascii=False, indent=2),
+        jsonio.dumps_pretty(data),
         encoding="utf-8",
     )
+
+
+class ConfigStore:
+    """
+    Live AppConfig plus its file. Changes are written back after `delay_s` of
+    quiet (each new change restarts the timer) instead of on every edit.
+    """
+
+    def __init__(self, path: Path, config: AppConfig | None = None, *, delay_s: float = 0.5) -> None:
+        self.path = path
+        self.config = config if config is not None else load_config(path)
+        self._delay_s = delay_s
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self._dirty = False
+
+    def set(self, key: str, value: object) -> None:
+        if key not in _FIELD_NAMES:
+            raise AttributeError(f"Unknown config field: {key}")
+        with self._lock:
+            setattr(self.config, key, value)
+        self.mark_dirty()
+
+    def replace(self, config: AppConfig) -> None:
+        """Swap in a whole new AppConfig (not persisted until mark_dirty()/flush_sync())."""
+        with self._lock:
+            self.config = config
+
+    def mark_dirty(self) -> None:
+        with self._lock:
+            self._dirty = True
+            self._cancel_timer_locked()
+            self._timer = threading.Timer(self._delay_s, self._flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush_sync(self) -> None:
+        """Write the config now, whether or not it changed."""
+        with self._lock:
+            self._cancel_timer_locked()
+            self._write_locked()
+
+    def close(self) -> None:
+        """Write pending changes, if any, and stop the timer."""
+        with self._lock:
+            self._cancel_timer_locked()
+            if self._dirty:
+                self._write_locked()
+
+    def _flush(self) -> None:
+        with self._lock:
+            self._timer = None
+            if not self._dirty:
+                return
+            try:
+                self._write_locked()
+            except OSError:
+                # Keep the changes pending: the next edit or close() writes them again.
+                self._dirty = True
+
+    def _cancel_timer_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _write_locked(self) -> None:
+        self._dirty = False
+        save_config(self.path, self.config)
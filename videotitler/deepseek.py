@@ -1,15 +1,114 @@
 from __future__ import annotations
 
+import hashlib
 import re
-import time
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-import requests
+from videotitler import jsonio
+from videotitler.net import RateLimiter, create_session, retry_with_backoff
+
+if TYPE_CHECKING:
+    import requests
+
+    from videotitler.net import Http2Session
 
 
 class DeepSeekError(RuntimeError):
     pass
 
 
+_REQUESTS_PER_SECOND = 5.0
+
+
+@dataclass(slots=True)
+class _Endpoint:
+    session: requests.Session | Http2Session
+    rate_limiter: RateLimiter
+
+
+_ENDPOINTS: dict[tuple[str, bool], _Endpoint] = {}
+_ENDPOINTS_LOCK = threading.Lock()
+
+
+def _get_endpoint(base_url: str, *, http2: bool = False) -> _Endpoint:
+    # One keep-alive session and rate limiter per base URL, shared by every title request.
+    with _ENDPOINTS_LOCK:
+        endpoint = _ENDPOINTS.get((base_url, http2))
+        if endpoint is None:
+            endpoint = _Endpoint(
+                session=create_session(http2=http2),
+                rate_limiter=RateLimiter(_REQUESTS_PER_SECOND),
+            )
+            _ENDPOINTS[(base_url, http2)] = endpoint
+        return endpoint
+
+
+class _TitleCache:
+    """Thread-safe LRU of generated titles, keyed by a digest of the full request."""
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = maxsize
+        self._items: OrderedDict[bytes, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes) -> str | None:
+        with self._lock:
+            title = self._items.get(key)
+            if title is not None:
+                self._items.move_to_end(key)
+            return title
+
+    def put(self, key: bytes, title: str) -> None:
+        with self._lock:
+            self._items[key] = title
+            self._items.move_to_end(key)
+            while len(self._items) > self._maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+_TITLE_CACHE = _TitleCache(maxsize=4096)
+
+
+def _title_cache_key(*parts: str) -> bytes:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.digest()
+
+
+_TITLE_PREFIX_RE = re.compile(r"^(?:标题|title)[:：\s]+", re.IGNORECASE)
+_TITLE_STRIP_CHARS = "\"“”'" + " \t\r\n\f\v\u3000"
+
+
+def _clean_title(title: str) -> str:
+    # Light cleanup in case the model returns quotes/prefixes.
+    title = title.strip(_TITLE_STRIP_CHARS)
+    return _TITLE_PREFIX_RE.sub("", title, count=1).strip(_TITLE_STRIP_CHARS)
+
+
+_SENTENCE_END_RE = re.compile(r"[。！？…]")
+_FAST_PATH_MAX_CHARS = 20
+
+
+def _title_from_single_line(ocr_text: str) -> str:
+    """Return the OCR text itself when it is already one short title-like line, else ""."""
+    lines = [line.strip() for line in ocr_text.splitlines() if line.strip()]
+    if len(lines) != 1:
+        return ""
+    line = lines[0]
+    if len(line) > _FAST_PATH_MAX_CHARS or _SENTENCE_END_RE.search(line):
+        return ""
+    return _clean_title(line)
+
+
 def _first_non_empty_line(text: str) -> str:
     for line in (text or "").splitlines():
         stripped = line.strip()
@@ -28,6 +127,9 @@ def extract_title_sentence(
     user_prompt_template: str,
     timeout_s: int = 60,
     retries: int = 2,
+    use_cache: bool = True,
+    fast_path: bool = True,
+    http2: bool = False,
 ) -> str:
     api_key = api_key.strip()
     if not api_key:
@@ -36,6 +138,12 @@ def extract_title_sentence(
     if not ocr_text.strip():
         raise DeepSeekError("OCR 文本为空。")
 
+    if fast_path:
+        # A single short line is already what the model would return.
+        title = _title_from_single_line(ocr_text)
+        if title:
+            return title
+
     base_url = (base_url or "").strip().rstrip("/")
     if not base_url:
         base_url = "https://api.deepseek.com/v1"
@@ -55,48 +163,53 @@ def extract_title_sentence(
         # If template formatting fails, fall back to appending OCR.
         user_prompt = user_prompt_template.rstrip() + "\n\nOCR 文本：\n" + ocr_text
 
-    retries = max(1, int(retries))
-    last_exc: Exception | None = None
-    for attempt in range(retries):
-        try:
-            response = requests.post(
-                url,
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": (model or "deepseek-chat"),
-                    "messages": [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt},
-                    ],
-                    "temperature": 0.2,
-                    "max_tokens": 80,
-                },
-                timeout=timeout_s,
-            )
-            response.raise_for_status()
-            payload = response.json()
-            break
-        except requests.RequestException as exc:
-            last_exc = exc
-            if attempt + 1 >= retries:
-                raise DeepSeekError(f"DeepSeek 请求失败（网络超时/连接）：{exc}") from exc
-            time.sleep(1.0 * (2**attempt))
-        except ValueError as exc:
-            raise DeepSeekError("DeepSeek 返回不是 JSON。") from exc
-    else:  # pragma: no cover
-        raise DeepSeekError(f"DeepSeek 请求失败：{last_exc}")
+    model = model or "deepseek-chat"
+    cache_key = _title_cache_key(base_url, model, system_prompt, user_prompt)
+    if use_cache:
+        cached = _TITLE_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
+    import requests
+
+    endpoint = _get_endpoint(base_url, http2=http2)
+
+    def send() -> dict:
+        endpoint.rate_limiter.acquire()
+        response = endpoint.session.post(
+            url,
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            },
+            json={
+                "model": model,
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                "temperature": 0.2,
+                "max_tokens": 80,
+            },
+            timeout=timeout_s,
+        )
+        response.raise_for_status()
+        return jsonio.loads(response.content)  # type: ignore[return-value]
+
+    try:
+        payload = retry_with_backoff(send, retries=retries)
+    except requests.RequestException as exc:
+        raise DeepSeekError(f"DeepSeek 请求失败（网络超时/连接）：{exc}") from exc
+    except ValueError as exc:
+        raise DeepSeekError("DeepSeek 返回不是 JSON。") from exc
 
     try:
         content = payload["choices"][0]["message"]["content"]
     except Exception as exc:
         raise DeepSeekError(f"DeepSeek 返回格式异常：{payload!r}") from exc
 
-    title = _first_non_empty_line(content)
-
-    # Light cleanup in case the model returns quotes/prefixes.
-    title = re.sub(r'^[\"“”\'\s]+|[\"“”\'\s]+$', "", title).strip()
-    title = re.sub(r"^(标题|title)[:：\s]+", "", title, flags=re.IGNORECASE).strip()
+    title = _clean_title(_first_non_empty_line(content))
+    if title:
+        _TITLE_CACHE.put(cache_key, title)
     return title
+
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import base64
+import functools
 import json
 import re
 import threading
@@ -13,7 +14,7 @@ from typing import Callable
 from videotitler.baidu_ocr import BaiduOcrClient
 from videotitler.config import AppConfig, load_non_secret_config, save_non_secret_config
 from videotitler.deepseek import extract_title_sentence
-from videotitler.rename import build_target_path, pick_non_conflicting_path
+from videotitler.rename import DirectoryNames, build_target_path, pick_non_conflicting_path
 from videotitler.video import extract_frame_as_png_bytes
 
 
@@ -43,8 +44,14 @@ def scan_videos(root_dir: Path, *, include_subdirs: bool) -> list[Path]:
 
 
 def _default_frame_extractor(path: Path, frame_number_1based: int) -> bytes:
-    png_bytes, _image = extract_frame_as_png_bytes(path, frame_number_1based)
-    return png_bytes
+    png, _image = extract_frame_as_png_bytes(path, frame_number_1based)
+    return bytes(png)
+
+
+@functools.lru_cache(maxsize=4)
+def _get_ocr_client(api_key: str, secret_key: str) -> BaiduOcrClient:
+    # Reuse the client so its access token and keep-alive session survive across frames.
+    return BaiduOcrClient(api_key, secret_key)
 
 
 def _default_ocr_recognizer(
@@ -54,7 +61,7 @@ def _default_ocr_recognizer(
     api_key: str,
     secret_key: str,
 ) -> str:
-    client = BaiduOcrClient(api_key, secret_key)
+    client = _get_ocr_client(api_key, secret_key)
     return client.recognize(png_bytes, endpoint=endpoint)
 
 
@@ -326,6 +333,7 @@ class DesktopWorker:
 
     def _run_processing(self, secrets: dict[str, str]) -> None:
         total = len(self._items)
+        names = DirectoryNames()
         for index, item in enumerate(list(self._items)):
             if self._stop_event.is_set():
                 break
@@ -359,7 +367,7 @@ class DesktopWorker:
                     system_prompt=self._config.deepseek_system_prompt,
                     user_prompt_template=self._config.deepseek_user_prompt_template,
                 )
-                target = self._compute_target_path(item)
+                target = self._compute_target_path(item, names)
                 item.new_name = target.name
                 self._emit_item_title(item)
 
@@ -369,6 +377,7 @@ class DesktopWorker:
                     item.status = "重命名…"
                     self._emit_item_status(item)
                     old_path.rename(target)
+                    names.record_rename(old_path, target)
                     item.path = target
                     self._emit_item_renamed(item, old_path=old_path, old_file_name=old_name)
 
@@ -386,6 +395,7 @@ class DesktopWorker:
 
     def _run_rename_all(self) -> None:
         total = len(self._items)
+        names = DirectoryNames()
         for index, item in enumerate(list(self._items)):
             if self._stop_event.is_set():
                 break
@@ -393,7 +403,7 @@ class DesktopWorker:
             title = item.suggested_title.strip() or "未识别"
             item.suggested_title = title
             try:
-                target = self._compute_target_path(item)
+                target = self._compute_target_path(item, names)
                 item.new_name = target.name
                 self._emit_item_title(item)
                 if self._config.dry_run:
@@ -407,6 +417,7 @@ class DesktopWorker:
                         item.status = "重命名…"
                         self._emit_item_status(item)
                         old_path.rename(target)
+                        names.record_rename(old_path, target)
                         item.path = target
                         self._emit_item_renamed(item, old_path=old_path, old_file_name=old_name)
                     item.status = "完成"
@@ -431,7 +442,7 @@ class DesktopWorker:
         if self._task_thread and self._task_thread.is_alive():
             raise RuntimeError("批处理正在运行中，请先停止当前任务。")
 
-    def _compute_target_path(self, item: WorkerVideoItem) -> Path:
+    def _compute_target_path(self, item: WorkerVideoItem, names: DirectoryNames | None = None) -> Path:
         index = self._config.start_index + self._items.index(item)
         target = build_target_path(
             item.path,
@@ -439,6 +450,8 @@ class DesktopWorker:
             index_padding=self._config.index_padding,
             title=item.suggested_title,
         )
+        if names is not None:
+            return names.pick_non_conflicting_path(target, ignore_path=item.path)
         return pick_non_conflicting_path(target, ignore_path=item.path)
 
     def _remember_recent_dir(self, directory: str) -> None:
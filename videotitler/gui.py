@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import os
 import re
 import threading
 import traceback
-from dataclasses import asdict, dataclass
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, replace
 from pathlib import Path
 from queue import Empty, Queue
 
@@ -15,35 +19,132 @@ except Exception:  # pragma: no cover
     BOTH = END = LEFT = RIGHT = X = Y = None  # type: ignore
 
 try:
-    from PIL import Image, ImageTk
+    from PIL import Image, ImageOps, ImageTk
 except Exception:  # pragma: no cover
     Image = None  # type: ignore
+    ImageOps = None  # type: ignore
     ImageTk = None  # type: ignore
 
 try:
+    from tkinter import TclError
     from tkinter.scrolledtext import ScrolledText
 except Exception:  # pragma: no cover
+    TclError = Exception  # type: ignore
     ScrolledText = None  # type: ignore
 
 from videotitler.baidu_ocr import BaiduOcrClient, BaiduOcrError
-from videotitler.config import AppConfig, default_config_path, load_config, save_config
+from videotitler.config import AppConfig, ConfigStore, default_config_path
 from videotitler.deepseek import DeepSeekError, extract_title_sentence
-from videotitler.rename import build_target_path, pick_non_conflicting_path
-from videotitler.video import VideoFrameError, extract_frame_as_png_bytes
+from videotitler.rename import (
+    DirectoryNames,
+    build_target_path,
+    build_target_path_fast,
+    index_prefix_format,
+    pick_non_conflicting_path,
+    sanitize_filename_component,
+)
+from videotitler.video import VideoFrameError, extract_frame_image, warm_up_ffmpeg
 
 
 VIDEO_EXTS = {".mp4", ".mov", ".mkv", ".avi", ".webm", ".m4v"}
 
+# Rows inserted into the Treeview per event-loop turn after a scan.
+_TREE_INSERT_BATCH = 300
+
+
+def _image_nbytes(image: object) -> int:
+    """Decoded size of a PIL image as Pillow stores it: multi-band pixels take 4 bytes."""
+    width, height = image.size  # type: ignore[attr-defined]
+    mode = image.mode  # type: ignore[attr-defined]
+    if mode in {"1", "L", "P"}:
+        bytes_per_pixel = 1
+    elif mode.startswith("I;16"):
+        bytes_per_pixel = 2
+    else:
+        # RGB/RGBX/RGBA/LA/CMYK/..., I and F.
+        bytes_per_pixel = 4
+    return width * height * bytes_per_pixel
+
+
+class _PreviewCache:
+    """LRU of decoded preview frames keyed by row iid, bounded by decoded size in bytes."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._items: OrderedDict[str, tuple[object, int]] = OrderedDict()
+        self._total_bytes = 0
+
+    def get(self, iid: str) -> object | None:
+        item = self._items.get(iid)
+        if item is None:
+            return None
+        self._items.move_to_end(iid)
+        return item[0]
+
+    def put(self, iid: str, image: object) -> None:
+        size = _image_nbytes(image)
+        old = self._items.pop(iid, None)
+        if old is not None:
+            self._total_bytes -= old[1]
+        self._items[iid] = (image, size)
+        self._total_bytes += size
+        # Keep at least the newest frame even if it alone exceeds the budget.
+        while self._total_bytes > self._max_bytes and len(self._items) > 1:
+            _, (_, evicted_size) = self._items.popitem(last=False)
+            self._total_bytes -= evicted_size
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._total_bytes = 0
+
+
+_PREVIEW_CACHE = _PreviewCache(max_bytes=256 * 1024 * 1024)
+
 
 @dataclass(slots=True)
 class VideoRow:
     path: Path
+    # Stable Treeview item id; unlike the path it survives renames.
+    iid: str = ""
     status: str = "待处理"
     ocr_text: str = ""
-    preview_image: object | None = None
+    # The decoded frame lives in _PREVIEW_CACHE; the row only keeps a weak
+    # reference, so evicted frames are freed once nothing else uses them.
+    preview_image_ref: weakref.ref[object] | None = None
+    # Frame the batch extracted for OCR; an evicted preview is re-read from it.
+    frame_number: int = 0
     title: str = ""
     new_name: str = ""
     error: str = ""
+    # Cached str(path) / path.name: the message loop keys and displays rows by these.
+    str_path: str = ""
+    name: str = ""
+
+    def __post_init__(self) -> None:
+        self.set_path(self.path)
+
+    def set_path(self, path: Path) -> None:
+        self.path = path
+        self.str_path = os.fspath(path)
+        self.name = path.name
+
+    def get_preview(self) -> object | None:
+        """The cached frame, or None when it was never extracted or has been evicted."""
+        image = _PREVIEW_CACHE.get(self.iid)
+        if image is None and self.preview_image_ref is not None:
+            image = self.preview_image_ref()
+        return image
+
+
+def _resolve_concurrency(concurrency: object) -> int:
+    # 0 = auto: half the cores, at least 2 (each worker mostly waits on ffmpeg or the network).
+    try:
+        workers = int(concurrency)  # type: ignore[call-overload]
+    except (TypeError, ValueError):
+        workers = 0
+    if workers > 0:
+        return workers
+    return max(2, (os.cpu_count() or 2) // 2)
 
 
 def _require_ui_deps() -> None:
@@ -81,21 +182,39 @@ class VideoTitlerApp:
     def __init__(self) -> None:
         _require_ui_deps()
 
-        self._config_path = default_config_path()
-        self._config = load_config(self._config_path)
+        self._config_store = ConfigStore(default_config_path())
+        self._config_path = self._config_store.path
 
         self._rows: list[VideoRow] = []
+        # Index for the per-event lookups in _update_row / _on_renamed.
+        self._rows_by_path: dict[str, VideoRow] = {}
+        self._rows_by_iid: dict[str, VideoRow] = {}
+        self._populate_generation = 0
+        # Mirrors of Tk state, so per-event updates don't ask Tk via exists()/selection().
+        self._tree_iids: set[str] = set()
+        self._selected_iid: str | None = None
         self._queue: "Queue[tuple[str, object]]" = Queue()
+        # Row updates from the queue, merged per path and applied once per drain.
+        self._pending: dict[str, dict[str, object]] = {}
         self._stop_event = threading.Event()
         self._worker: threading.Thread | None = None
 
         self._img_cache: ImageTk.PhotoImage | None = None
+        # (max_w, max_h, source image) that produced _img_cache, to skip re-rendering it.
+        self._img_cache_key: tuple[int, int, weakref.ref] | None = None
+        # Rows whose evicted preview frame is being extracted again.
+        self._preview_requests: set[str] = set()
 
         self._build_ui()
         self._load_config_to_ui()
+        self._bind_option_autosave()
 
+        self._root.protocol("WM_DELETE_WINDOW", self._on_close)
         self._root.after(100, self._drain_queue)
 
+        # Prime ffmpeg while the user is still picking a directory.
+        threading.Thread(target=warm_up_ffmpeg, daemon=True).start()
+
     def _build_ui(self) -> None:
         self._root = ttk.Window(themename="flatly")
         self._root.title("VideoTitler - OCR + DeepSeek 自动命名")
@@ -125,6 +244,7 @@ class VideoTitlerApp:
         self._include_subdirs_var = ttk.BooleanVar(value=False)
         self._dry_run_var = ttk.BooleanVar(value=False)
         self._ocr_mode_var = ttk.StringVar(value="accurate_basic")
+        self._ocr_fast_mode_var = ttk.BooleanVar(value=True)
 
         ttk.Label(options, text="第 X 帧(从1开始)").pack(side=LEFT)
         ttk.Spinbox(options, from_=1, to=1_000_000, width=8, textvariable=self._frame_var).pack(
@@ -157,6 +277,9 @@ class VideoTitlerApp:
             state="readonly",
         )
         self._ocr_mode_combo.pack(side=LEFT, padx=(8, 0))
+        ttk.Checkbutton(options, text="快速(不检测方向)", variable=self._ocr_fast_mode_var).pack(
+            side=LEFT, padx=(8, 0)
+        )
 
         actions = ttk.Frame(self._root, padding=(10, 0, 10, 10))
         actions.pack(fill=X)
@@ -318,6 +441,15 @@ class VideoTitlerApp:
         grid.rowconfigure(8, weight=1)
         grid.rowconfigure(9, weight=2)
 
+    def _on_close(self) -> None:
+        try:
+            self._config_store.close()
+        except OSError as exc:
+            from tkinter import messagebox
+
+            messagebox.showerror("VideoTitler", f"保存设置失败：{exc}", parent=self._root)
+        self._root.destroy()
+
     def _append_log(self, message: str) -> None:
         self._log_text.insert(END, message.rstrip() + "\n")
         self._log_text.see(END)
@@ -331,14 +463,9 @@ class VideoTitlerApp:
         self._ocr_text.see("1.0")
 
     def _get_selected_row(self) -> VideoRow | None:
-        selection = self._tree.selection()
-        if not selection:
+        if self._selected_iid is None:
             return None
-        path = Path(selection[0])
-        for row in self._rows:
-            if row.path == path:
-                return row
-        return None
+        return self._rows_by_iid.get(self._selected_iid)
 
     def _compute_index_for_row(self, row: VideoRow) -> int:
         cfg = self._read_ui_to_config()
@@ -391,8 +518,8 @@ class VideoTitlerApp:
             row.error = ""
         row.status = "已编辑"
         self._set_error("")
-        self._append_log(f"已保存 OCR 编辑：{row.path.name}")
-        self._update_row(row.path, status=row.status, ocr_text=row.ocr_text, error=row.error)
+        self._append_log(f"已保存 OCR 编辑：{row.name}")
+        self._update_row(row.str_path, status=row.status, ocr_text=row.ocr_text, error=row.error)
 
     def _save_title_edit(self) -> None:
         row = self._get_selected_row()
@@ -407,8 +534,8 @@ class VideoTitlerApp:
             row.error = ""
         row.status = "已编辑"
         self._set_error("")
-        self._append_log(f"已保存标题：{row.path.name}")
-        self._update_row(row.path, status=row.status, title=row.title, new_name=row.new_name, error=row.error)
+        self._append_log(f"已保存标题：{row.name}")
+        self._update_row(row.str_path, status=row.status, title=row.title, new_name=row.new_name, error=row.error)
 
     def _generate_title_for_selected(self) -> None:
         if self._worker and self._worker.is_alive():
@@ -434,7 +561,7 @@ class VideoTitlerApp:
         row.status = "DeepSeek…"
         row.error = ""
         self._set_error("")
-        self._update_row(row.path, status=row.status, ocr_text=row.ocr_text, error=row.error)
+        self._update_row(row.str_path, status=row.status, ocr_text=row.ocr_text, error=row.error)
 
         src_path = row.path
         index = self._compute_index_for_row(row)
@@ -444,6 +571,7 @@ class VideoTitlerApp:
         base_url = cfg.deepseek_base_url
         model = cfg.deepseek_model
         api_key = cfg.deepseek_api_key
+        http2 = cfg.use_http2
 
         def worker() -> None:
             try:
@@ -454,6 +582,10 @@ class VideoTitlerApp:
                     ocr_text=ocr_text,
                     system_prompt=system_prompt,
                     user_prompt_template=user_prompt_template,
+                    http2=http2,
+                    # An explicit "regenerate" click must reach DeepSeek with the user's prompts.
+                    use_cache=False,
+                    fast_path=False,
                 )
                 target = build_target_path(
                     src_path,
@@ -512,7 +644,7 @@ class VideoTitlerApp:
             self._update_row(old_path, status="重命名…", title=row.title, new_name=row.new_name)
             old_path.rename(target)
             self._queue.put(("renamed", (old_path, target)))
-            row.path = target
+            row.set_path(target)
             row.status = "完成"
             row.error = ""
             self._set_error("")
@@ -526,7 +658,7 @@ class VideoTitlerApp:
             self._update_row(old_path, status=row.status, error=row.error)
 
     def _load_config_to_ui(self) -> None:
-        cfg = self._config
+        cfg = self._config_store.config
         self._dir_var.set(cfg.input_dir)
         self._include_subdirs_var.set(bool(cfg.include_subdirs))
         self._frame_var.set(int(cfg.frame_number_1based or 1))
@@ -534,6 +666,7 @@ class VideoTitlerApp:
         self._padding_var.set(int(cfg.index_padding or 3))
         self._dry_run_var.set(bool(cfg.dry_run))
         self._ocr_mode_var.set((cfg.baidu_ocr_mode or "accurate_basic").strip())
+        self._ocr_fast_mode_var.set(bool(cfg.ocr_fast_mode))
 
         self._deepseek_base_url_var.set(cfg.deepseek_base_url or "https://api.deepseek.com/v1")
         self._deepseek_model_var.set(cfg.deepseek_model or "deepseek-chat")
@@ -547,8 +680,34 @@ class VideoTitlerApp:
             self._baidu_secret_key_var.set(cfg.baidu_secret_key)
             self._deepseek_api_key_var.set(cfg.deepseek_api_key)
 
+    def _bind_option_autosave(self) -> None:
+        # Option toggles go through the store, which writes them back debounced.
+        for key, var, convert in (
+            ("frame_number_1based", self._frame_var, int),
+            ("start_index", self._start_index_var, int),
+            ("index_padding", self._padding_var, int),
+            ("include_subdirs", self._include_subdirs_var, bool),
+            ("dry_run", self._dry_run_var, bool),
+            ("baidu_ocr_mode", self._ocr_mode_var, str),
+            ("ocr_fast_mode", self._ocr_fast_mode_var, bool),
+        ):
+            var.trace_add(
+                "write",
+                lambda *_args, key=key, var=var, convert=convert: self._on_option_changed(key, var, convert),
+            )
+
+    def _on_option_changed(self, key: str, var: object, convert: type) -> None:
+        try:
+            value = convert(var.get())  # type: ignore[attr-defined]
+        except (TclError, ValueError):
+            # Half-typed spinbox text: wait for a valid value.
+            return
+        self._config_store.set(key, value)
+
     def _read_ui_to_config(self) -> AppConfig:
-        cfg = self._config
+        # Fill a copy and swap it in under the store lock, so a debounced flush
+        # on the timer thread never serializes a half-updated config.
+        cfg = replace(self._config_store.config)
         cfg.input_dir = self._dir_var.get().strip()
         cfg.include_subdirs = bool(self._include_subdirs_var.get())
         cfg.frame_number_1based = int(self._frame_var.get() or 1)
@@ -556,6 +715,7 @@ class VideoTitlerApp:
         cfg.index_padding = int(self._padding_var.get() or 3)
         cfg.dry_run = bool(self._dry_run_var.get())
         cfg.baidu_ocr_mode = (self._ocr_mode_var.get() or "accurate_basic").strip()
+        cfg.ocr_fast_mode = bool(self._ocr_fast_mode_var.get())
 
         cfg.baidu_api_key = self._baidu_api_key_var.get().strip()
         cfg.baidu_secret_key = self._baidu_secret_key_var.get().strip()
@@ -570,6 +730,7 @@ class VideoTitlerApp:
         if cfg.input_dir:
             existing = [d for d in cfg.recent_dirs if d != cfg.input_dir]
             cfg.recent_dirs = [cfg.input_dir, *existing][:10]
+        self._config_store.replace(cfg)
         return cfg
 
     def _reset_prompts(self) -> None:
@@ -594,17 +755,17 @@ class VideoTitlerApp:
         if cfg.baidu_ocr_mode not in {"accurate_basic", "general_basic"}:
             self._append_log("OCR 模式无效，请选择 accurate_basic 或 general_basic。")
             return
-        save_config(self._config_path, cfg)
+        self._config_store.flush_sync()
         self._append_log(f"已保存设置：{self._config_path}")
 
     def _snapshot_config(self) -> AppConfig:
         cfg = self._read_ui_to_config()
-        save_config(self._config_path, cfg)
+        self._config_store.flush_sync()
         return AppConfig(**asdict(cfg))
 
     def _scan(self) -> None:
         cfg = self._read_ui_to_config()
-        save_config(self._config_path, cfg)
+        self._config_store.mark_dirty()
 
         root_dir = Path(cfg.input_dir)
         if not root_dir.exists():
@@ -612,21 +773,45 @@ class VideoTitlerApp:
             return
 
         videos = _scan_videos(root_dir, include_subdirs=cfg.include_subdirs)
-        self._rows = [VideoRow(path=p) for p in videos]
+        self._rows = [VideoRow(path=p, iid=f"r{n}") for n, p in enumerate(videos)]
+        self._rows_by_path = {row.str_path: row for row in self._rows}
+        self._rows_by_iid = {row.iid: row for row in self._rows}
+        self._pending.clear()
+        # iids restart at r0 with every scan.
+        _PREVIEW_CACHE.clear()
+        self._preview_requests.clear()
+
+        children = self._tree.get_children()
+        if children:
+            self._tree.delete(*children)
+        self._tree_iids.clear()
+        self._selected_iid = None
+
+        self._populate_generation += 1
+        self._populate_tree(self._populate_generation, 0)
 
-        for item in self._tree.get_children():
-            self._tree.delete(item)
+        self._progress.configure(value=0, maximum=max(1, len(self._rows)))
+        self._append_log(f"扫描到 {len(self._rows)} 个视频。")
 
-        for row in self._rows:
+    def _populate_tree(self, generation: int, start: int) -> None:
+        # Insert rows in batches from the event loop so a directory with thousands
+        # of clips shows its first page immediately instead of freezing the window.
+        # Rows not yet inserted still receive updates in the model (_update_row
+        # skips missing items) and are inserted with their current values.
+        if generation != self._populate_generation:
+            return  # A newer scan replaced the rows.
+
+        end = min(start + _TREE_INSERT_BATCH, len(self._rows))
+        for row in self._rows[start:end]:
             self._tree.insert(
                 "",
                 END,
-                iid=str(row.path),
-                values=(row.path.name, row.status, row.title, row.new_name),
+                iid=row.iid,
+                values=(row.name, row.status, row.title, row.new_name),
             )
-
-        self._progress.configure(value=0, maximum=max(1, len(self._rows)))
-        self._append_log(f"扫描到 {len(self._rows)} 个视频。")
+            self._tree_iids.add(row.iid)
+        if end < len(self._rows):
+            self._root.after(1, self._populate_tree, generation, end)
 
     def _start(self) -> None:
         if self._worker and self._worker.is_alive():
@@ -667,7 +852,8 @@ class VideoTitlerApp:
 
     def _run_rename_all(self, cfg: AppConfig) -> None:
         start_index = int(cfg.start_index or 1)
-        index_padding = int(cfg.index_padding or 3)
+        prefix_format = index_prefix_format(int(cfg.index_padding or 3))
+        names = DirectoryNames()
 
         for offset, row in enumerate(self._rows):
             if self._stop_event.is_set():
@@ -678,13 +864,12 @@ class VideoTitlerApp:
 
             old_path = row.path
             try:
-                target = build_target_path(
+                target = build_target_path_fast(
                     old_path,
-                    index=fixed_index,
-                    index_padding=index_padding,
-                    title=title,
+                    prefix_format.format(fixed_index),
+                    sanitize_filename_component(title),
                 )
-                target = pick_non_conflicting_path(target, ignore_path=old_path)
+                target = names.pick_non_conflicting_path(target, ignore_path=old_path)
                 self._queue.put(("title", (old_path, title, target.name)))
 
                 if cfg.dry_run:
@@ -692,6 +877,7 @@ class VideoTitlerApp:
                 else:
                     if target != old_path:
                         old_path.rename(target)
+                        names.record_rename(old_path, target)
                         self._queue.put(("renamed", (old_path, target)))
                         self._queue.put(("status", (target, "完成")))
                     else:
@@ -706,27 +892,40 @@ class VideoTitlerApp:
         self._queue.put(("done", "重命名结束。"))
 
     def _run_worker(self, cfg: AppConfig) -> None:
-        ocr_client = BaiduOcrClient(cfg.baidu_api_key, cfg.baidu_secret_key)
-
-        for offset, row in enumerate(self._rows):
+        ocr_client = BaiduOcrClient(cfg.baidu_api_key, cfg.baidu_secret_key, http2=cfg.use_http2)
+        names = DirectoryNames()
+        # Conflict resolution and the rename itself must not interleave across rows.
+        rename_lock = threading.Lock()
+        prefix_format = index_prefix_format(cfg.index_padding)
+        progress_lock = threading.Lock()
+        completed = 0
+
+        def process(offset: int, row: VideoRow) -> None:
+            nonlocal completed
             if self._stop_event.is_set():
-                break
+                return
 
+            path = row.path
             fixed_index = int(cfg.start_index or 1) + offset
             stage = "读取帧"
-            self._queue.put(("status", (row.path, "读取帧…")))
+            self._queue.put(("status", (path, "读取帧…")))
             try:
                 stage = "读取帧"
-                png_bytes, image = extract_frame_as_png_bytes(row.path, cfg.frame_number_1based)
-                self._queue.put(("preview", (row.path, image)))
+                image = extract_frame_image(path, cfg.frame_number_1based)
+                self._queue.put(("preview", (path, image, cfg.frame_number_1based)))
 
                 stage = "OCR"
-                self._queue.put(("status", (row.path, "OCR…")))
-                ocr_text = ocr_client.recognize(png_bytes, endpoint=cfg.baidu_ocr_mode)
-                self._queue.put(("ocr", (row.path, ocr_text)))
+                self._queue.put(("status", (path, "OCR…")))
+                # Hand over the decoded frame so OCR skips a second PNG decode.
+                ocr_text = ocr_client.recognize(
+                    image,
+                    endpoint=cfg.baidu_ocr_mode,
+                    detect_direction=not cfg.ocr_fast_mode,
+                )
+                self._queue.put(("ocr", (path, ocr_text)))
 
                 stage = "DeepSeek"
-                self._queue.put(("status", (row.path, "DeepSeek…")))
+                self._queue.put(("status", (path, "DeepSeek…")))
                 title = extract_title_sentence(
                     api_key=cfg.deepseek_api_key,
                     base_url=cfg.deepseek_base_url,
@@ -734,37 +933,51 @@ class VideoTitlerApp:
                     ocr_text=ocr_text,
                     system_prompt=cfg.deepseek_system_prompt,
                     user_prompt_template=cfg.deepseek_user_prompt_template,
+                    http2=cfg.use_http2,
                 )
 
-                target = build_target_path(
-                    row.path,
-                    index=fixed_index,
-                    index_padding=cfg.index_padding,
-                    title=title,
+                target = build_target_path_fast(
+                    path,
+                    prefix_format.format(fixed_index),
+                    sanitize_filename_component(title),
                 )
-                target = pick_non_conflicting_path(target, ignore_path=row.path)
+                with rename_lock:
+                    target = names.pick_non_conflicting_path(target, ignore_path=path)
 
-                new_name = target.name
-                self._queue.put(("title", (row.path, title, new_name)))
+                    new_name = target.name
+                    self._queue.put(("title", (path, title, new_name)))
 
-                if not cfg.dry_run:
-                    stage = "重命名"
-                    old_path = row.path
-                    if target != old_path:
-                        old_path.rename(target)
-                        self._queue.put(("renamed", (old_path, target)))
+                    if not cfg.dry_run:
+                        stage = "重命名"
+                        if target != path:
+                            path.rename(target)
+                            names.record_rename(path, target)
+                            self._queue.put(("renamed", (path, target)))
 
-                if cfg.dry_run or target == row.path:
-                    self._queue.put(("status", (row.path, "完成")))
+                if cfg.dry_run or target == path:
+                    self._queue.put(("status", (path, "完成")))
                 else:
                     self._queue.put(("status", (target, "完成")))
             except (VideoFrameError, BaiduOcrError, DeepSeekError, OSError) as exc:
-                self._queue.put(("error", (row.path, f"{stage}失败：{exc}")))
+                self._queue.put(("error", (path, f"{stage}失败：{exc}")))
             except Exception:
-                self._queue.put(("error", (row.path, f"{stage}异常：\n{traceback.format_exc()}")))
+                self._queue.put(("error", (path, f"{stage}异常：\n{traceback.format_exc()}")))
             finally:
-                self._queue.put(("progress", offset + 1))
-
+                with progress_lock:
+                    completed += 1
+                    self._queue.put(("progress", completed))
+
+        # Each video is independent: frame extraction (ffmpeg / PyAV) and the
+        # OCR / DeepSeek round trips overlap across videos. Results still reach
+        # the UI through the queue, in completion order.
+        with ThreadPoolExecutor(
+            max_workers=_resolve_concurrency(cfg.concurrency),
+            thread_name_prefix="videotitler",
+        ) as executor:
+            for offset, row in enumerate(self._rows):
+                executor.submit(process, offset, row)
+
+        ocr_client.close()
         self._queue.put(("done", "处理结束。"))
 
     def _drain_queue(self) -> None:
@@ -774,7 +987,20 @@ class VideoTitlerApp:
             except Empty:
                 break
             self._handle_event(kind, payload)
-        self._root.after(120, self._drain_queue)
+        self._flush_pending()
+        # ~30 Hz: worker bursts are coalesced into one Treeview update per row per tick.
+        self._root.after(33, self._drain_queue)
+
+    def _stage_update(self, path: str | Path, **fields: object) -> None:
+        # Keyed by str: os.fspath() is the identity for str and pathlib caches str(path).
+        self._pending.setdefault(os.fspath(path), {}).update(fields)
+
+    def _flush_pending(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        for path, fields in pending.items():
+            self._update_row(path, **fields)  # type: ignore[arg-type]
 
     def _handle_event(self, kind: str, payload: object) -> None:
         if kind == "progress":
@@ -789,128 +1015,209 @@ class VideoTitlerApp:
                 self._append_log("处理结束。")
             return
 
+        if kind == "preview_error":
+            iid, message = payload  # type: ignore[misc]
+            self._preview_requests.discard(iid)
+            self._append_log(str(message))
+            return
+
         if kind == "preview":
-            path, image = payload  # type: ignore[misc]
-            self._update_row(path, preview_image=image)
-            self._set_preview_image(path, image)
+            path, image, frame_number = payload  # type: ignore[misc]
+            # _update_row shows it when this row is selected or nothing is.
+            self._stage_update(path, preview_image=image, frame_number=int(frame_number))
+            return
+
+        if kind == "preview_reloaded":
+            # Keyed by iid: the row may have been renamed while the frame was read.
+            iid, image = payload  # type: ignore[misc]
+            # Not pending any more means a rescan reused the iid: drop the stale frame.
+            requested = iid in self._preview_requests
+            self._preview_requests.discard(iid)
+            row = self._rows_by_iid.get(iid)
+            if requested and row is not None:
+                self._stage_update(row.str_path, preview_image=image)
             return
 
         if kind == "ocr":
             path, ocr_text = payload  # type: ignore[misc]
-            self._update_row(path, ocr_text=str(ocr_text))
+            self._stage_update(path, ocr_text=str(ocr_text))
             return
 
         if kind == "title":
             path, title, new_name = payload  # type: ignore[misc]
-            self._update_row(path, title=str(title), new_name=str(new_name))
+            self._stage_update(path, title=str(title), new_name=str(new_name))
             return
 
         if kind == "renamed":
             old_path, new_path = payload  # type: ignore[misc]
+            # Staged updates are keyed by the old path: apply them before re-keying.
+            self._flush_pending()
             self._on_renamed(old_path, new_path)
             return
 
         if kind == "status":
             path, status = payload  # type: ignore[misc]
-            self._update_row(path, status=str(status))
+            self._stage_update(path, status=str(status))
             return
 
         if kind == "error":
             path, error = payload  # type: ignore[misc]
-            self._update_row(path, status="失败", error=str(error))
-            self._append_log(f"[失败] {Path(path).name}: {error}")
+            self._stage_update(path, status="失败", error=str(error))
+            row = self._rows_by_path.get(os.fspath(path))
+            name = row.name if row is not None else Path(path).name
+            self._append_log(f"[失败] {name}: {error}")
             return
 
     def _on_renamed(self, old_path: Path, new_path: Path) -> None:
-        old_iid = str(old_path)
-        new_iid = str(new_path)
-
-        for row in self._rows:
-            if row.path == old_path:
-                row.path = new_path
-                break
-
-        if not self._tree.exists(old_iid):
+        row = self._rows_by_path.pop(os.fspath(old_path), None)
+        if row is None:
             return
+        row.set_path(new_path)
+        self._rows_by_path[row.str_path] = row
 
-        parent = self._tree.parent(old_iid)
-        index = self._tree.index(old_iid)
-        was_selected = old_iid in self._tree.selection()
-
-        values = list(self._tree.item(old_iid, "values"))
-        if values:
-            values[0] = new_path.name
-        self._tree.delete(old_iid)
-        self._tree.insert(parent, index, iid=new_iid, values=values)
-        if was_selected:
-            self._tree.selection_set(new_iid)
-            self._tree.focus(new_iid)
+        # The iid does not depend on the path: only the file column changes,
+        # so the item keeps its position and selection without delete/insert.
+        if row.iid in self._tree_iids:
+            self._tree.set(row.iid, "file", row.name)
 
     def _update_row(
         self,
-        path: Path,
+        path: str | Path,
         *,
         status: str | None = None,
         ocr_text: str | None = None,
         preview_image: object | None = None,
+        frame_number: int | None = None,
         title: str | None = None,
         new_name: str | None = None,
         error: str | None = None,
     ) -> None:
-        for row in self._rows:
-            if row.path == path:
-                if status is not None:
-                    row.status = status
-                if ocr_text is not None:
-                    row.ocr_text = ocr_text
-                if preview_image is not None:
-                    row.preview_image = preview_image
-                if title is not None:
-                    row.title = title
-                if new_name is not None:
-                    row.new_name = new_name
-                if error is not None:
-                    row.error = error
-
-                iid = str(row.path)
-                if self._tree.exists(iid):
-                    self._tree.item(iid, values=(row.path.name, row.status, row.title, row.new_name))
-
-                # If currently selected, refresh details
-                selected = self._tree.selection()
-                if selected and selected[0] == iid:
-                    self._sync_selected_details(row)
-                return
+        row = self._rows_by_path.get(os.fspath(path))
+        if row is None:
+            return
+
+        # Detail-pane fields that actually changed; status/new_name live only in the tree.
+        dirty: set[str] = set()
+        if status is not None:
+            row.status = status
+        if ocr_text is not None and ocr_text != row.ocr_text:
+            row.ocr_text = ocr_text
+            dirty.add("ocr_text")
+        if preview_image is not None and preview_image is not row.get_preview():
+            _PREVIEW_CACHE.put(row.iid, preview_image)
+            row.preview_image_ref = weakref.ref(preview_image)
+            self._preview_requests.discard(row.iid)
+            dirty.add("preview")
+        if frame_number is not None:
+            row.frame_number = frame_number
+        if title is not None and title != row.title:
+            row.title = title
+            dirty.add("title")
+        if new_name is not None:
+            row.new_name = new_name
+        if error is not None and error != row.error:
+            row.error = error
+            dirty.add("error")
+
+        iid = row.iid
+        if iid in self._tree_iids:
+            # Only touch the columns that changed.
+            if status is not None:
+                self._tree.set(iid, "status", row.status)
+            if title is not None:
+                self._tree.set(iid, "title", row.title)
+            if new_name is not None:
+                self._tree.set(iid, "new_name", row.new_name)
+
+        # If currently selected, refresh the details that changed
+        if dirty and self._selected_iid == iid:
+            self._sync_selected_details(row, dirty)
+        elif "preview" in dirty and self._selected_iid is None:
+            # Nothing selected: the pane follows the batch with the newest frame.
+            self._set_preview_image(iid, preview_image)  # type: ignore[arg-type]
 
     def _on_select(self, _event: object) -> None:
+        selection = self._tree.selection()
+        self._selected_iid = selection[0] if selection else None
         row = self._get_selected_row()
         if row is None:
             return
         self._sync_selected_details(row)
 
-    def _set_preview_image(self, path: Path, image: Image.Image) -> None:
-        selection = self._tree.selection()
-        if selection and selection[0] != str(path):
-            return
+    def _preview_bounds(self) -> tuple[int, int]:
+        return (
+            max(480, self._preview_label.winfo_width() - 20),
+            max(320, self._preview_label.winfo_height() - 20),
+        )
 
-        max_w = max(480, self._preview_label.winfo_width() - 20)
-        max_h = max(320, self._preview_label.winfo_height() - 20)
+    def _set_preview_image(self, iid: str, image: Image.Image) -> None:
+        if self._selected_iid is not None and self._selected_iid != iid:
+            return
 
-        preview = image.copy()
-        preview.thumbnail((max_w, max_h))
+        max_w, max_h = self._preview_bounds()
+        key = self._img_cache_key
+        if key is not None and key[:2] == (max_w, max_h) and key[2]() is image:
+            # Same frame at the same pane size: the current PhotoImage is still right.
+            return
+        if image.width <= max_w and image.height <= max_h:
+            preview = image
+        else:
+            # contain() resizes into a new image: no full-frame copy of the cached
+            # original first. Bilinear is plenty for an on-screen preview.
+            preview = ImageOps.contain(image, (max_w, max_h), method=Image.Resampling.BILINEAR)
         photo = ImageTk.PhotoImage(preview)
         self._img_cache = photo
+        self._img_cache_key = (max_w, max_h, weakref.ref(image))
         self._preview_label.configure(image=photo, text="")
 
-    def _sync_selected_details(self, row: VideoRow) -> None:
-        self._set_ocr_text(row.ocr_text)
-        self._title_var.set(row.title or "")
-        self._set_error(row.error)
-        if row.preview_image is not None:
-            self._set_preview_image(row.path, row.preview_image)  # type: ignore[arg-type]
+    def _clear_preview_image(self, text: str) -> None:
+        self._img_cache = None
+        self._img_cache_key = None
+        self._preview_label.configure(image="", text=text)
+
+    def _sync_selected_details(self, row: VideoRow, dirty: set[str] | None = None) -> None:
+        # dirty=None refreshes everything (selection changed).
+        if dirty is None or "ocr_text" in dirty:
+            self._set_ocr_text(row.ocr_text)
+        if dirty is None or "title" in dirty:
+            self._title_var.set(row.title or "")
+        if dirty is None or "error" in dirty:
+            self._set_error(row.error)
+        if dirty is not None and "preview" not in dirty:
+            return
+
+        image = row.get_preview()
+        if image is not None:
+            self._set_preview_image(row.iid, image)  # type: ignore[arg-type]
+        elif row.preview_image_ref is not None:
+            # Extracted before but evicted from the cache: decode it again.
+            self._clear_preview_image("(正在重新读取预览帧…)")
+            self._request_preview(row)
         else:
-            self._img_cache = None
-            self._preview_label.configure(image="", text="(暂无预览帧：请先处理或保持选中等待处理)")
+            self._clear_preview_image("(暂无预览帧：请先处理或保持选中等待处理)")
+
+    def _request_preview(self, row: VideoRow) -> None:
+        iid = row.iid
+        if iid in self._preview_requests:
+            return
+
+        path = row.path
+        # The frame the row's OCR text came from, not whatever the spinbox shows now.
+        frame_number = row.frame_number or int(self._config_store.config.frame_number_1based or 1)
+        # Only shown, never OCR'd: let the decoder downscale to the preview pane.
+        max_size = self._preview_bounds()
+
+        def worker() -> None:
+            try:
+                image = extract_frame_image(path, frame_number, max_preview_size=max_size)
+            except Exception as exc:
+                self._queue.put(("preview_error", (iid, f"[预览失败] {path.name}: {exc}")))
+                return
+            self._queue.put(("preview_reloaded", (iid, image)))
+
+        # Only mark the request once it is certain to report back.
+        self._preview_requests.add(iid)
+        threading.Thread(target=worker, daemon=True).start()
 
 
 def run_app() -> None:
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import json
+
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+def loads(data: bytes | str) -> object:
+    # orjson parses straight from bytes and raises a ValueError subclass, like json.
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_pretty(data: object) -> str:
+    """Same output as json.dumps(data, ensure_ascii=False, indent=2)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(data, ensure_ascii=False, indent=2)
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import random
+import re
+import threading
+import time
+from collections.abc import Callable
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, TypeVar
+
+if TYPE_CHECKING:
+    import requests
+
+
+T = TypeVar("T")
+
+_RATE_LIMIT_TEXT_RE = re.compile(r"rate.?limit|quota", re.IGNORECASE)
+
+
+class RateLimitedError(RuntimeError):
+    """Raised by a request attempt when the server reports throttling in its payload."""
+
+    def __init__(self, message: str, *, retry_after_s: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_after_s = retry_after_s
+
+
+class Http2Response:
+    """The subset of requests.Response used by the API clients, backed by httpx."""
+
+    def __init__(self, response: object) -> None:
+        self._response = response
+
+    @property
+    def status_code(self) -> int:
+        return self._response.status_code  # type: ignore[attr-defined]
+
+    @property
+    def headers(self) -> object:
+        return self._response.headers  # type: ignore[attr-defined]
+
+    @property
+    def content(self) -> bytes:
+        return self._response.content  # type: ignore[attr-defined]
+
+    @property
+    def text(self) -> str:
+        return self._response.text  # type: ignore[attr-defined]
+
+    def raise_for_status(self) -> None:
+        import requests
+
+        if self.status_code >= 400:
+            raise requests.HTTPError(
+                f"{self.status_code} Error for url: {self._response.url}",  # type: ignore[attr-defined]
+                response=self,  # type: ignore[arg-type]
+            )
+
+
+class Http2Session:
+    """
+    requests.Session-style facade over httpx.Client(http2=True).
+
+    httpx errors are re-raised as the matching requests exceptions so callers
+    and retry_with_backoff handle both transports the same way.
+    """
+
+    def __init__(self, client: object) -> None:
+        self._client = client
+
+    def post(
+        self,
+        url: str,
+        *,
+        params: dict[str, str] | None = None,
+        data: bytes | dict[str, str] | None = None,
+        json: object = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> Http2Response:
+        import httpx
+        import requests
+
+        body: dict[str, object] = {}
+        if isinstance(data, (bytes, bytearray)):
+            body["content"] = bytes(data)
+        elif data is not None:
+            body["data"] = data
+        if json is not None:
+            body["json"] = json
+
+        try:
+            response = self._client.post(  # type: ignore[attr-defined]
+                url,
+                params=params,
+                headers=headers,
+                timeout=timeout,
+                **body,
+            )
+        except httpx.TimeoutException as exc:
+            raise requests.Timeout(str(exc)) from exc
+        except httpx.HTTPError as exc:
+            raise requests.ConnectionError(str(exc)) from exc
+        return Http2Response(response)
+
+    def close(self) -> None:
+        self._client.close()  # type: ignore[attr-defined]
+
+
+def _create_http2_session(pool_size: int) -> Http2Session | None:
+    # Optional: httpx[http2]. Falls back to requests (HTTP/1.1) when missing.
+    try:
+        import httpx
+
+        client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=pool_size, max_connections=pool_size * 2),
+        )
+    except ImportError:
+        return None
+    return Http2Session(client)
+
+
+def create_session(*, pool_size: int = 8, http2: bool = False) -> requests.Session | Http2Session:
+    # Keep-alive connections are reused across OCR / DeepSeek calls, so the
+    # TCP + TLS handshake is paid once per host instead of once per request.
+    # Retries are handled by the callers, hence max_retries=0 here.
+    if http2:
+        # HTTP/2 multiplexes concurrent requests over a single TLS connection.
+        session = _create_http2_session(pool_size)
+        if session is not None:
+            return session
+
+    # requests is imported lazily to keep it off the GUI startup path.
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class RateLimiter:
+    """Thread-safe limiter enforcing a minimum interval between requests."""
+
+    def __init__(self, rate_per_s: float) -> None:
+        self._interval_s = 1.0 / rate_per_s if rate_per_s > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_send_ts = 0.0
+
+    def acquire(self) -> None:
+        if self._interval_s <= 0:
+            return
+
+        # Reserve the next send slot under the lock, then sleep outside it so
+        # concurrent callers queue up one interval apart.
+        with self._lock:
+            now = time.monotonic()
+            send_ts = max(now, self._next_send_ts)
+            self._next_send_ts = send_ts + self._interval_s
+
+        delay = send_ts - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def _classify(exc: Exception) -> tuple[bool, bool, float | None]:
+    """Return (retryable, rate_limited, retry_after_s) for a failed attempt."""
+    import requests
+
+    if isinstance(exc, RateLimitedError):
+        return True, True, exc.retry_after_s
+
+    response = getattr(exc, "response", None)
+    if not isinstance(exc, requests.HTTPError) or response is None:
+        # Connection resets, timeouts, etc.
+        return True, False, None
+
+    retry_after_s = _parse_retry_after(response.headers.get("Retry-After"))
+    if response.status_code == 429 or _RATE_LIMIT_TEXT_RE.search(response.text or ""):
+        return True, True, retry_after_s
+    if 400 <= response.status_code < 500 and response.status_code != 408:
+        # Bad credentials / bad request: retrying will not help.
+        return False, False, None
+    return True, False, retry_after_s
+
+
+def retry_with_backoff(
+    fn: Callable[[], T],
+    *,
+    retries: int,
+    base_s: float = 1.0,
+    cap_s: float = 30.0,
+    min_wait_s: float = 0.5,
+) -> T:
+    """
+    Call fn up to `retries` times, sleeping between failed attempts.
+
+    Throttled responses (HTTP 429, "rate limit"/"quota" bodies, RateLimitedError)
+    honor Retry-After when present; other transient errors use exponential
+    backoff. The last error is re-raised unchanged.
+    """
+    import requests
+
+    retries = max(1, int(retries))
+    for attempt in range(retries):
+        try:
+            return fn()
+        except (requests.RequestException, RateLimitedError) as exc:
+            retryable, rate_limited, retry_after_s = _classify(exc)
+            if not retryable or attempt + 1 >= retries:
+                raise
+
+            delay = base_s * (2**attempt)
+            if retry_after_s is not None:
+                delay = retry_after_s
+            if rate_limited:
+                delay = max(min_wait_s, delay)
+            delay = min(cap_s, delay)
+            time.sleep(delay + random.uniform(0, 0.1 * delay))
+
+    raise AssertionError("unreachable")  # pragma: no cover
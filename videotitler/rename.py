@@ -1,16 +1,19 @@
 from __future__ import annotations
 
-import re
+import os
 from pathlib import Path
 
 
-_WINDOWS_INVALID_CHARS_RE = re.compile(r'[<>:"/\\|?*\x00-\x1F]')
+# Characters Windows rejects in file names, ASCII control chars and zero-width spaces -> " ".
+_WINDOWS_INVALID_CHARS_TABLE = str.maketrans(
+    dict.fromkeys([*'<>:"/\\|?*', *map(chr, range(0x20)), "\u200b"], " ")
+)
 
 
 def sanitize_filename_component(text: str, *, fallback: str = "标题", max_len: int = 80) -> str:
-    cleaned = (text or "").replace("\u200b", " ").strip()
-    cleaned = re.sub(r"\s+", " ", cleaned)
-    cleaned = _WINDOWS_INVALID_CHARS_RE.sub(" ", cleaned)
+    # One C-level translate pass, then split()/join() collapses whitespace runs
+    # (including the spaces just substituted) without going through re.
+    cleaned = " ".join((text or "").translate(_WINDOWS_INVALID_CHARS_TABLE).split())
     cleaned = cleaned.strip(" .")
     cleaned = cleaned.strip()
 
@@ -22,6 +25,21 @@ def sanitize_filename_component(text: str, *, fallback: str = "标题", max_len:
     return cleaned
 
 
+def index_prefix_format(index_padding: int) -> str:
+    """Format string for zero-padded index prefixes, built once per batch: fmt.format(index)."""
+    return f"{{:0{max(1, int(index_padding))}d}}"
+
+
+def build_target_path_fast(src_path: Path, prefix: str, safe_title: str) -> Path:
+    """
+    Batch variant of build_target_path: prefix and safe_title are used as is, so
+    they must come from index_prefix_format() / sanitize_filename_component().
+    """
+    # A sanitized title has no separators, so parent / name is safe and skips
+    # with_name()'s validation.
+    return src_path.parent / f"{prefix}-{safe_title}{src_path.suffix}"
+
+
 def build_target_path(
     src_path: Path,
     *,
@@ -29,17 +47,39 @@ def build_target_path(
     index_padding: int,
     title: str,
 ) -> Path:
-    safe_title = sanitize_filename_component(title)
-    prefix = str(index).zfill(max(1, int(index_padding)))
-    filename = f"{prefix}-{safe_title}{src_path.suffix}"
-    return src_path.with_name(filename)
+    return build_target_path_fast(
+        src_path,
+        index_prefix_format(index_padding).format(index),
+        sanitize_filename_component(title),
+    )
 
 
-def pick_non_conflicting_path(target_path: Path, *, ignore_path: Path | None = None) -> Path:
+def pick_non_conflicting_path(
+    target_path: Path,
+    *,
+    ignore_path: Path | None = None,
+    existing_names: set[str] | None = None,
+) -> Path:
+    """
+    Return target_path, or the first free "<stem>_<n><suffix>" next to it.
+
+    existing_names (os.path.normcase'd names in target_path.parent, see
+    DirectoryNames) replaces the per-candidate stat() calls.
+    """
     if ignore_path is not None and target_path == ignore_path:
         return target_path
 
-    if not target_path.exists():
+    if existing_names is None:
+
+        def exists(path: Path) -> bool:
+            return path.exists()
+
+    else:
+
+        def exists(path: Path) -> bool:
+            return os.path.normcase(path.name) in existing_names
+
+    if not exists(target_path):
         return target_path
 
     stem = target_path.stem
@@ -49,6 +89,54 @@ def pick_non_conflicting_path(target_path: Path, *, ignore_path: Path | None = N
     counter = 2
     while True:
         candidate = parent / f"{stem}_{counter}{suffix}"
-        if not candidate.exists():
+        if not exists(candidate):
             return candidate
         counter += 1
+
+
+class DirectoryNames:
+    """
+    File names per directory for a batch of renames.
+
+    Each directory is listed once with os.scandir; record_rename() keeps the
+    snapshot current as the batch renames files. The snapshot only narrows
+    the search: the picked name is still checked on disk.
+    """
+
+    def __init__(self) -> None:
+        self._names: dict[Path, set[str] | None] = {}
+
+    def names_in(self, directory: Path) -> set[str] | None:
+        """Normcase'd names in directory, or None if it cannot be listed (callers then stat)."""
+        if directory not in self._names:
+            try:
+                with os.scandir(directory) as entries:
+                    self._names[directory] = {os.path.normcase(entry.name) for entry in entries}
+            except OSError:
+                self._names[directory] = None
+        return self._names[directory]
+
+    def pick_non_conflicting_path(self, target_path: Path, *, ignore_path: Path | None = None) -> Path:
+        """
+        Pick a free name from the snapshot, then confirm it with one stat():
+        a batch can run for minutes, and rename() would replace a file that
+        appeared since the directory was listed.
+        """
+        names = self.names_in(target_path.parent)
+        while True:
+            candidate = pick_non_conflicting_path(
+                target_path,
+                ignore_path=ignore_path,
+                existing_names=names,
+            )
+            if names is None or candidate == ignore_path or not candidate.exists():
+                return candidate
+            names.add(os.path.normcase(candidate.name))
+
+    def record_rename(self, old_path: Path, new_path: Path) -> None:
+        old_names = self.names_in(old_path.parent)
+        if old_names is not None:
+            old_names.discard(os.path.normcase(old_path.name))
+        new_names = self.names_in(new_path.parent)
+        if new_names is not None:
+            new_names.add(os.path.normcase(new_path.name))
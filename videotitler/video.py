@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import functools
 import io
 import os
 import shutil
 import subprocess
+import threading
+from collections import deque
+from fractions import Fraction
 from pathlib import Path
 
 from PIL import Image
@@ -13,6 +17,24 @@ class VideoFrameError(RuntimeError):
     pass
 
 
+class LazyPNG:
+    """PNG encoding of a frame, produced on the first bytes() call and cached."""
+
+    __slots__ = ("_image", "_data")
+
+    def __init__(self, image: Image.Image) -> None:
+        self._image = image
+        self._data: bytes | None = None
+
+    def __bytes__(self) -> bytes:
+        if self._data is None:
+            buffer = io.BytesIO()
+            # Fast deflate: the bytes are only uploaded / previewed, never stored.
+            self._image.save(buffer, format="PNG", compress_level=1)
+            self._data = buffer.getvalue()
+        return self._data
+
+
 def _safe_which(cmd: str | os.PathLike[str], *, path: str | os.PathLike[str] | None = None) -> str | None:
     # On Windows before Python 3.12, passing PathLike to shutil.which could fail.
     # Always coerce to str to avoid that runtime edge case and the deprecated PathLike overload.
@@ -21,58 +43,375 @@ def _safe_which(cmd: str | os.PathLike[str], *, path: str | os.PathLike[str] | N
     return shutil.which(cmd_str, path=path_str)
 
 
-def extract_frame_as_png_bytes(
+# PATH lookups are cached: every extraction needs ffmpeg, and shutil.which
+# stats each PATH entry. A miss is cleared by the caller so a later attempt
+# can find a freshly installed binary.
+@functools.lru_cache(maxsize=1)
+def _find_ffmpeg() -> str | None:
+    return _safe_which("ffmpeg") or _safe_which("ffmpeg.exe")
+
+
+@functools.lru_cache(maxsize=1)
+def _find_ffprobe() -> str | None:
+    return _safe_which("ffprobe") or _safe_which("ffprobe.exe")
+
+
+@functools.lru_cache(maxsize=1)
+def _get_av() -> object | None:
+    # Optional: PyAV decodes in-process, avoiding an ffmpeg spawn + demuxer init per frame.
+    try:
+        import av
+
+        return av
+    except Exception:
+        return None
+
+
+def warm_up_ffmpeg() -> bool:
+    """
+    Resolve and run `ffmpeg -version` once, typically on a background thread at startup.
+
+    The first real extraction then finds the binary (and its DLLs on Windows) in the
+    lookup and OS file caches instead of paying that cold start on the first video.
+    Also imports PyAV when installed. Returns whether ffmpeg ran successfully.
+    """
+    _get_av()
+    ffmpeg = _find_ffmpeg()
+    if not ffmpeg:
+        _find_ffmpeg.cache_clear()
+        return False
+    try:
+        proc = subprocess.run(
+            [ffmpeg, "-hide_banner", "-version"],
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return proc.returncode == 0
+
+
+def _fit_size(width: int, height: int, max_size: tuple[int, int]) -> tuple[int, int]:
+    scale = min(1.0, max_size[0] / width, max_size[1] / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _decode_frame_with_av(
     video_path: Path,
-    frame_number_1based: int,
-) -> tuple[bytes, Image.Image]:
+    frame_index: int,
+    max_size: tuple[int, int] | None = None,
+) -> Image.Image | None:
+    """Decode the 0-based frame with PyAV; None when PyAV is missing or cannot locate it."""
+    av = _get_av()
+    if av is None:
+        return None
+
+    try:
+        with av.open(str(video_path)) as container:  # type: ignore[attr-defined]
+            stream = container.streams.video[0]
+            stream.thread_type = "AUTO"
+            rate = stream.average_rate
+            if not rate:
+                return None
+
+            start_s = float(stream.start_time * stream.time_base) if stream.start_time is not None else 0.0
+            # Frame n starts at n / fps; accept anything from half a frame earlier
+            # to absorb timestamp rounding.
+            target_s = start_s + (frame_index - 0.5) / float(rate)
+            if frame_index > 0:
+                # Seek to the keyframe at or before the target, then decode forward.
+                container.seek(int(target_s / stream.time_base), stream=stream, backward=True, any_frame=False)
+
+            for frame in container.decode(stream):
+                if frame.time is not None and frame.time >= target_s:
+                    if max_size is not None:
+                        # swscale downsizes straight from the decoder's YUV planes.
+                        width, height = _fit_size(frame.width, frame.height, max_size)
+                        if (width, height) != (frame.width, frame.height):
+                            frame = frame.reformat(width=width, height=height, format="rgb24")
+                    return frame.to_image()
+    except Exception:
+        return None
+    # Past the end: let the ffmpeg path apply its last-frame fallback.
+    return None
+
+
+def _validate_frame_number(frame_number_1based: int) -> int:
     if frame_number_1based < 1:
         raise VideoFrameError("帧序号必须是 >= 1 的整数。")
+    return frame_number_1based - 1
 
-    ffmpeg = _safe_which("ffmpeg") or _safe_which("ffmpeg.exe")
-    if not ffmpeg:
-        raise VideoFrameError("未找到 ffmpeg：请先安装 ffmpeg 并加入 PATH。")
 
-    frame_index = frame_number_1based - 1
+# str(path) -> (st_mtime_ns, frame rate or None); a changed file is probed again.
+_FRAME_RATE_CACHE: dict[str, tuple[int, float | None]] = {}
+_FRAME_RATE_CACHE_LOCK = threading.Lock()
 
-    def run_extract(args: list[str]) -> bytes:
+
+def _parse_frame_rate(output: str) -> float | None:
+    """
+    Frame rate from ffprobe "key=value" stream entries.
+
+    avg_frame_rate matches PyAV's stream.average_rate; r_frame_rate is often
+    doubled for field-coded or VFR sources, so it is only the fallback when
+    the average is unknown ("0/0").
+    """
+    rates = dict(line.strip().partition("=")[::2] for line in output.splitlines() if "=" in line)
+    for key in ("avg_frame_rate", "r_frame_rate"):
+        try:
+            rate = Fraction(rates.get(key, ""))
+        except (ValueError, ZeroDivisionError):
+            continue
+        if rate > 0:
+            return float(rate)
+    return None
+
+
+def _probe_frame_rate(video_path: Path) -> float | None:
+    try:
+        mtime_ns = video_path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+    key = str(video_path)
+    with _FRAME_RATE_CACHE_LOCK:
+        cached = _FRAME_RATE_CACHE.get(key)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    fps: float | None = None
+    ffprobe = _find_ffprobe()
+    if ffprobe:
         try:
             proc = subprocess.run(
-                args,
+                [
+                    ffprobe,
+                    "-v",
+                    "error",
+                    "-select_streams",
+                    "v:0",
+                    "-show_entries",
+                    "stream=avg_frame_rate,r_frame_rate",
+                    "-of",
+                    "default=noprint_wrappers=1",
+                    str(video_path),
+                ],
                 check=False,
                 capture_output=True,
-                timeout=60,
+                timeout=30,
             )
-        except subprocess.TimeoutExpired as exc:
-            raise VideoFrameError("ffmpeg 抽帧超时。") from exc
+            fps = _parse_frame_rate(proc.stdout.decode("ascii", errors="replace"))
+        except (OSError, subprocess.TimeoutExpired):
+            fps = None
+    else:
+        _find_ffprobe.cache_clear()
+
+    with _FRAME_RATE_CACHE_LOCK:
+        _FRAME_RATE_CACHE[key] = (mtime_ns, fps)
+    return fps
+
 
-        if proc.returncode != 0:
-            stderr = (proc.stderr or b"").decode("utf-8", errors="replace").strip()
-            raise VideoFrameError(f"ffmpeg 抽帧失败：{stderr or '未知错误'}")
-        return proc.stdout or b""
+def extract_frame_image(
+    video_path: Path,
+    frame_number_1based: int,
+    *,
+    exact: bool = False,
+    max_preview_size: tuple[int, int] | None = None,
+) -> Image.Image:
+    """
+    Return the frame as a decoded image, skipping PNG encoding when PyAV is available.
+
+    By default the frame is located by timestamp (frame_index / fps) with a keyframe
+    seek, which is fast for late frames. exact=True counts decoded frames from the
+    start instead, which only differs for variable frame rate videos.
+
+    max_preview_size=(w, h) downscales (never upscales) inside the decoder, for
+    previews; leave it None when the frame is used for OCR.
+    """
+    frame_index = _validate_frame_number(frame_number_1based)
+    if not exact:
+        image = _decode_frame_with_av(video_path, frame_index, max_preview_size)
+        if image is not None:
+            return image
+    return _extract_frame_with_ffmpeg(
+        video_path,
+        frame_number_1based,
+        exact=exact,
+        max_size=max_preview_size,
+    )
+
+
+def extract_frame_as_png_bytes(
+    video_path: Path,
+    frame_number_1based: int,
+    *,
+    exact: bool = False,
+    max_preview_size: tuple[int, int] | None = None,
+) -> tuple[LazyPNG, Image.Image]:
+    """Return (png, image); the PNG is only encoded when bytes(png) is requested."""
+    image = extract_frame_image(
+        video_path,
+        frame_number_1based,
+        exact=exact,
+        max_preview_size=max_preview_size,
+    )
+    return LazyPNG(image), image
+
+
+def _image_from_ppm(data: bytes | bytearray) -> Image.Image:
+    """
+    Build an image straight from binary 8-bit PPM (what ffmpeg's ppm encoder writes).
+
+    The pixel block goes to Image.frombuffer through a memoryview, with no BytesIO
+    wrapper or decoder pass. Anything else (comments, 16-bit samples) falls back to
+    Image.open.
+    """
+    # Header: "P6" <ws> width <ws> height <ws> maxval <single ws> pixels
+    fields: list[bytes] = []
+    offset = 0
+    size = len(data)
+    while len(fields) < 4 and offset < size:
+        while offset < size and data[offset] in b" \t\r\n":
+            offset += 1
+        start = offset
+        while offset < size and data[offset] not in b" \t\r\n":
+            offset += 1
+        fields.append(bytes(data[start:offset]))
+    offset += 1  # The single whitespace byte after maxval.
+
+    try:
+        magic, width, height, maxval = fields[0], int(fields[1]), int(fields[2]), int(fields[3])
+    except (IndexError, ValueError):
+        magic, width, height, maxval = b"", 0, 0, 0
+    pixel_bytes = width * height * 3
+    if magic != b"P6" or maxval != 255 or width <= 0 or height <= 0 or size - offset < pixel_bytes:
+        image = Image.open(io.BytesIO(data))
+        image.load()
+        return image
+
+    pixels = memoryview(data)[offset : offset + pixel_bytes]
+    return Image.frombuffer("RGB", (width, height), pixels, "raw", "RGB", 0, 1)
+
+
+_FFMPEG_TIMEOUT_S = 60
+_STDERR_TAIL_LINES = 50
+_READ_CHUNK_SIZE = 1024 * 1024
+
+
+def _run_ffmpeg(args: list[str], *, timeout_s: float = _FFMPEG_TIMEOUT_S) -> bytearray:
+    """
+    Run ffmpeg and return its stdout.
+
+    stderr is drained on a separate thread into a bounded tail, so a chatty
+    ffmpeg can neither block on a full pipe nor grow memory without limit.
+    """
+    try:
+        proc = subprocess.Popen(
+            args,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+    except OSError as exc:
+        raise VideoFrameError(f"ffmpeg 启动失败：{exc}") from exc
+
+    stderr_tail: deque[bytes] = deque(maxlen=_STDERR_TAIL_LINES)
+
+    def drain_stderr() -> None:
+        for line in proc.stderr:  # type: ignore[union-attr]
+            stderr_tail.append(line)
+
+    timed_out = threading.Event()
+
+    def kill() -> None:
+        timed_out.set()
+        proc.kill()
+
+    stderr_thread = threading.Thread(target=drain_stderr, daemon=True)
+    stderr_thread.start()
+    timer = threading.Timer(timeout_s, kill)
+    timer.daemon = True
+    timer.start()
+
+    output = bytearray()
+    try:
+        while chunk := proc.stdout.read1(_READ_CHUNK_SIZE):  # type: ignore[union-attr]
+            output += chunk
+        proc.wait()
+    finally:
+        timer.cancel()
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        stderr_thread.join(timeout=5)
+        proc.stdout.close()  # type: ignore[union-attr]
+        proc.stderr.close()  # type: ignore[union-attr]
+
+    if timed_out.is_set():
+        raise VideoFrameError("ffmpeg 抽帧超时。")
+    if proc.returncode != 0:
+        stderr = b"".join(stderr_tail).decode("utf-8", errors="replace").strip()
+        raise VideoFrameError(f"ffmpeg 抽帧失败：{stderr or '未知错误'}")
+    return output
+
+
+def _extract_frame_with_ffmpeg(
+    video_path: Path,
+    frame_number_1based: int,
+    *,
+    exact: bool,
+    max_size: tuple[int, int] | None,
+) -> Image.Image:
+    ffmpeg = _find_ffmpeg()
+    if not ffmpeg:
+        _find_ffmpeg.cache_clear()
+        raise VideoFrameError("未找到 ffmpeg：请先安装 ffmpeg 并加入 PATH。")
+
+    frame_index = frame_number_1based - 1
+
+    scale_filters: list[str] = []
+    if max_size is not None:
+        scale_filters.append(
+            f"scale='min(iw,{int(max_size[0])})':'min(ih,{int(max_size[1])})'"
+            ":force_original_aspect_ratio=decrease"
+        )
+    filters = list(scale_filters)
+
+    fps = None if exact or frame_index == 0 else _probe_frame_rate(video_path)
+    if frame_index == 0:
+        # The first decoded frame: no seek or filter needed.
+        frame_args: list[str] = ["-i", str(video_path), "-map", "0:v:0"]
+    elif fps is not None:
+        # Input seeking jumps to the keyframe before the timestamp via the demuxer
+        # index and decodes only from there. Aim half a frame early so timestamp
+        # rounding cannot land on the next frame.
+        seek_s = max(0.0, (frame_index - 0.5) / fps)
+        frame_args = ["-ss", f"{seek_s:.6f}", "-i", str(video_path), "-map", "0:v:0"]
+    else:
+        # Use select filter to pick 0-based frame index (decodes every frame before it).
+        frame_args = ["-i", str(video_path), "-map", "0:v:0"]
+        filters.insert(0, f"select=eq(n\\,{frame_index})")
+    if filters:
+        frame_args += ["-vf", ",".join(filters)]
 
-    # Use select filter to pick 0-based frame index.
     args = [
         ffmpeg,
         "-hide_banner",
         "-loglevel",
         "error",
         "-nostdin",
-        "-i",
-        str(video_path),
-        "-map",
-        "0:v:0",
-        "-vf",
-        f"select=eq(n\\,{frame_index})",
+        *frame_args,
         "-frames:v",
         "1",
         "-f",
         "image2pipe",
         "-vcodec",
-        "png",
+        "ppm",
         "pipe:1",
     ]
-    png_bytes = run_extract(args)
-    if not png_bytes:
+    # PPM is a tiny header plus raw RGB: no deflate in ffmpeg, no inflate here.
+    ppm_bytes = _run_ffmpeg(args)
+    if not ppm_bytes:
         # Fallback to last frame (near end) when requested index is out of range.
         args_last = [
             ffmpeg,
@@ -86,22 +425,22 @@ def extract_frame_as_png_bytes(
             str(video_path),
             "-map",
             "0:v:0",
+            *(["-vf", ",".join(scale_filters)] if scale_filters else []),
             "-frames:v",
             "1",
             "-f",
             "image2pipe",
             "-vcodec",
-            "png",
+            "ppm",
             "pipe:1",
         ]
-        png_bytes = run_extract(args_last)
-        if not png_bytes:
+        ppm_bytes = _run_ffmpeg(args_last)
+        if not ppm_bytes:
             raise VideoFrameError(f"读取帧失败：{video_path} (frame={frame_number_1based})")
 
     try:
-        image = Image.open(io.BytesIO(png_bytes))
-        image.load()
+        image = _image_from_ppm(ppm_bytes)
     except Exception as exc:
-        raise VideoFrameError("PNG 解码失败（ffmpeg 输出异常）。") from exc
+        raise VideoFrameError("帧解码失败（ffmpeg 输出异常）。") from exc
 
-    return png_bytes, image
+    return image
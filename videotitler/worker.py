@@ -3,11 +3,13 @@ from __future__ import annotations
 import json
 import os
 import sys
+import threading
 import traceback
 from pathlib import Path
 
 from videotitler.config import default_config_path
 from videotitler.desktop_worker import DesktopWorker, WorkerProtocol
+from videotitler.video import warm_up_ffmpeg
 
 
 def _resolve_config_path() -> Path:
@@ -22,6 +24,8 @@ def main() -> int:
         config_path = _resolve_config_path()
         protocol = WorkerProtocol()
         worker = DesktopWorker(config_path=config_path, emit=protocol.emit)
+        # Prime ffmpeg while the desktop app is still loading its settings.
+        threading.Thread(target=warm_up_ffmpeg, daemon=True).start()
 
         for raw_line in sys.stdin:
             line = raw_line.strip()